@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module: str) -> List[Dict]:
+    """
+    Import a module in a fresh interpreter with -X importtime and collect the timings.
+
+    Args:
+        module (str): Dotted module name (e.g., 'travel_agent.agent')
+
+    Returns:
+        List[Dict]: One entry per imported module with 'module', 'self_us', 'cumulative_us' and 'depth'
+    """
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [REPO_ROOT, os.getenv('PYTHONPATH')]))}
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+        })
+    return entries
+
+
+def summarize(module: str, runs: int, top: int) -> Dict:
+    """
+    Import a module several times and report the fastest run, by package and by slowest module.
+
+    Args:
+        module (str): Dotted module name
+        runs (int): Number of fresh-interpreter imports
+        top (int): Number of modules to list
+
+    Returns:
+        dict: Total import time, time per top-level package and the slowest modules
+    """
+    best = min((measure(module) for _ in range(runs)), key=lambda entries: sum(entry['self_us'] for entry in entries))
+
+    packages = defaultdict(int)
+    for entry in best:
+        packages[entry['module'].split('.')[0]] += entry['self_us']
+
+    ours = [entry for entry in best if entry['module'].split('.')[0] == module.split('.')[0]]
+    return {
+        'module': module,
+        'total_ms': round(sum(entry['self_us'] for entry in best) / 1000, 1),
+        'modules_imported': len(best),
+        'by_package_ms': {name: round(us / 1000, 1) for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]},
+        'slowest_modules_ms': {
+            entry['module']: round(entry['self_us'] / 1000, 1)
+            for entry in sorted(best, key=lambda entry: -entry['self_us'])[:top]
+        },
+        'own_modules_ms': {
+            entry['module']: {'self': round(entry['self_us'] / 1000, 1), 'cumulative': round(entry['cumulative_us'] / 1000, 1)}
+            for entry in ours
+        },
+    }
+
+
+def print_report(report: Dict):
+    print(f"import {report['module']}: {report['total_ms']} ms, {report['modules_imported']} modules")
+    print('\nBy top-level package (self time):')
+    for name, ms in report['by_package_ms'].items():
+        print(f"  {name:<40}{ms:>10} ms")
+    print('\nSlowest modules (self time):')
+    for name, ms in report['slowest_modules_ms'].items():
+        print(f"  {name:<40}{ms:>10} ms")
+    print('\nPackage modules (self / cumulative):')
+    for name, times in report['own_modules_ms'].items():
+        print(f"  {name:<40}{times['self']:>10} ms{times['cumulative']:>10} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report where the import time of a module goes.')
+    parser.add_argument('--module', default='travel_agent.agent', help='module to import (default: travel_agent.agent)')
+    parser.add_argument('--runs', type=int, default=3, help='fresh imports to run; the fastest is reported (default: 3)')
+    parser.add_argument('--top', type=int, default=15, help='packages and modules to list (default: 15)')
+    parser.add_argument('--json', help='also write the report to this file')
+    args = parser.parse_args(argv)
+
+    report = summarize(args.module, args.runs, args.top)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
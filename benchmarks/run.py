@@ -0,0 +1,210 @@
+import argparse
+import asyncio
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('AMADEUS_CLIENT_ID', 'benchmark')
+os.environ.setdefault('AMADEUS_CLIENT_SECRET', 'benchmark')
+os.environ.setdefault('RAPIDAPI_KEY', 'benchmark')
+os.environ['TRAVEL_AGENT_CACHE'] = 'off'
+os.environ['TRAVEL_AGENT_GEOCODE_PATH'] = 'off'
+os.environ['TRAVEL_AGENT_GAZETTEER'] = 'off'
+os.environ['TRAVEL_AGENT_HOTEL_CATALOG_PATH'] = 'off'
+
+from benchmarks.stub_server import StubConfig, StubUpstream  # noqa: E402
+from travel_agent import ratelimit, registry, transport  # noqa: E402
+
+BASE_DATE = date(2026, 12, 13)
+
+
+def _day(i: int, offset: int = 0) -> str:
+    return (BASE_DATE + timedelta(days=i % 300 + offset)).strftime('%m/%d/%y')
+
+
+# Benchmark name -> (registered tool, call with per-request arguments)
+TOOL_CALLS: Dict[str, Tuple[str, Callable]] = {
+    'flights': ('check_flights', lambda tool, i: tool('JFK', _day(i), 'LAX')),
+    'flights_flexible': ('check_flights_flexible', lambda tool, i: tool('JFK', _day(i), _day(i, 6), 'LAX')),
+    'round_trip': ('check_round_trip', lambda tool, i: tool('LAX', 'JFK', _day(i), _day(i, 5), adults=2)),
+    'hotels': ('check_hotels', lambda tool, i: tool('PAR', _day(i), _day(i, 2))),
+    'weather': ('check_weather', lambda tool, i: tool('Paris', _day(i))),
+    'weather_range': ('check_weather_range', lambda tool, i: tool('Paris', _day(i), _day(i, 6))),
+    'car_rentals': ('check_car_rentals', lambda tool, i: tool('LAX', _day(i), _day(i, 3))),
+}
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return round(1000 * ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 1)
+
+
+async def run_level(call: Callable, concurrency: int, total: int) -> dict:
+    """
+    Run `total` calls of one tool with at most `concurrency` in flight.
+
+    Every call uses different arguments, so neither the cache nor request
+    coalescing hides the upstream path being measured.
+
+    Returns:
+        dict: Latency percentiles in ms, throughput and error count
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(i):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            result = await call(i)
+            latencies.append(time.perf_counter() - start)
+            if result.get('status') != 'success':
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'concurrency': concurrency,
+        'requests': total,
+        'errors': errors,
+        'p50_ms': _percentile(latencies, 0.50),
+        'p95_ms': _percentile(latencies, 0.95),
+        'p99_ms': _percentile(latencies, 0.99),
+        'throughput_rps': round(total / elapsed, 1),
+    }
+
+
+async def measure_allocations(call: Callable, samples: int) -> dict:
+    """
+    Measure peak traced memory per call for one tool, one call at a time.
+
+    Returns:
+        dict: Average and maximum peak allocation per call in KiB
+    """
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(samples):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            await call(10_000 + i)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return {
+        'alloc_peak_kib_avg': round(sum(peaks) / len(peaks) / 1024, 1),
+        'alloc_peak_kib_max': round(max(peaks) / 1024, 1),
+    }
+
+
+async def run(args) -> dict:
+    upstream = StubUpstream(StubConfig(args.latency_ms, args.jitter, args.error_rate, args.provider_rate)).start()
+    for provider in registry.PROVIDERS:
+        registry.use_provider_backend(provider, upstream.base_url)
+    if not args.rate_limits:
+        for provider in ratelimit.DEFAULT_RATES:
+            ratelimit.set_limiter(provider, None)
+    if args.hedge:
+        transport.set_hedge_policy(transport.HedgePolicy(percentile=args.hedge_percentile / 100, budget=args.hedge_budget))
+
+    report = {
+        'config': {'latency_ms': args.latency_ms, 'jitter': args.jitter, 'error_rate': args.error_rate, 'provider_rate': args.provider_rate, 'requests': args.requests, 'hedge': args.hedge},
+        'tools': {},
+    }
+    try:
+        for tool in args.tools:
+            name, call_with = TOOL_CALLS[tool]
+            spec = registry.tool_specs()[name]
+            call = functools.partial(call_with, spec.function)
+            await call(-1)
+            levels = []
+            for concurrency in args.concurrency:
+                before = dict(upstream.requests)
+                level = await run_level(call, concurrency, args.requests)
+                level['upstream_requests'] = sum(upstream.requests.values()) - sum(before.values())
+                levels.append(level)
+            policy = {'tool': name, 'provider': spec.provider, 'cached': spec.cached, 'coalesced': spec.coalesced, 'memoized': spec.memoized}
+            report['tools'][tool] = {'policy': policy, 'levels': levels, **await measure_allocations(call, args.alloc_samples)}
+    finally:
+        for provider in registry.PROVIDERS:
+            registry.use_provider_backend(provider, None)
+        upstream.stop()
+
+    report['transport'] = transport.transport_metrics()
+    report['rate_limits'] = ratelimit.rate_limit_usage()
+    report['stub_rate_limited'] = upstream.rate_limited
+    return report
+
+
+def print_report(report: dict):
+    config = report['config']
+    print(f"Stub upstream: median latency {config['latency_ms']} ms, jitter {config['jitter']}, error rate {config['error_rate']}")
+    header = f"{'tool':<14}{'conc':>6}{'reqs':>6}{'errs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}{'upstream':>10}"
+    print(header)
+    print('-' * len(header))
+    for tool, result in report['tools'].items():
+        policy = result['policy']
+        flags = [flag for flag in ('cached', 'coalesced', 'memoized') if policy[flag]]
+        for level in result['levels']:
+            print(
+                f"{tool:<14}{level['concurrency']:>6}{level['requests']:>6}{level['errors']:>6}"
+                f"{level['p50_ms']:>10}{level['p95_ms']:>10}{level['p99_ms']:>10}"
+                f"{level['throughput_rps']:>9}{level['upstream_requests']:>10}"
+            )
+        print(f"{'':<14}{policy['tool']} via {policy['provider']}: {', '.join(flags) or 'not cached or coalesced'}")
+        print(f"{'':<14}allocations per call: {result['alloc_peak_kib_avg']} KiB avg peak, {result['alloc_peak_kib_max']} KiB max peak")
+    for provider, usage in report['rate_limits'].items():
+        print(
+            f"Rate limiter {provider}: {usage['used_today']} requests, {usage['throttled']} throttled (429), "
+            f"{usage['queued']} queued for {usage['wait_seconds']}s, {usage['rejected']} rejected, rate now {usage['rate']}/s"
+        )
+    for host, metrics in report['transport'].items():
+        if metrics['hedges']:
+            print(f"Hedged requests to {host}: {metrics['hedges']} of {metrics['requests']}, hedge answered first in {metrics['hedge_wins']} ({metrics['hedge_win_rate']:.0%})")
+    if report['stub_rate_limited']:
+        print(f"Stub upstream answered {report['stub_rate_limited']} requests with 429 (provider rate limit)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the travel agent tools offline against recorded upstream fixtures.')
+    parser.add_argument('--tools', default=','.join(TOOL_CALLS), help=f"comma-separated tools to run (default: all of {', '.join(TOOL_CALLS)})")
+    parser.add_argument('--concurrency', default='1,8,32', help='comma-separated concurrency levels (default: 1,8,32)')
+    parser.add_argument('--requests', type=int, default=64, help='calls per concurrency level (default: 64)')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='median simulated upstream latency (default: 50)')
+    parser.add_argument('--jitter', type=float, default=0.5, help='log-normal sigma of the simulated latency (default: 0.5)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of upstream requests answered with 429/500 (default: 0)')
+    parser.add_argument('--provider-rate', type=float, default=0.0, help='requests per second the stub accepts per provider before answering 429 (default: 0 = unlimited)')
+    parser.add_argument('--rate-limits', action='store_true', help='keep the client-side provider rate limiters on (default: off, to measure raw throughput)')
+    parser.add_argument('--hedge', action='store_true', help='hedge slow upstream GET requests (default: off)')
+    parser.add_argument('--hedge-percentile', type=float, default=95.0, help='latency percentile after which a request is hedged (default: 95)')
+    parser.add_argument('--hedge-budget', type=float, default=0.05, help='hedges allowed per upstream request (default: 0.05)')
+    parser.add_argument('--alloc-samples', type=int, default=5, help='sequential calls used to measure allocations (default: 5)')
+    parser.add_argument('--json', help='also write the full report to this file')
+    args = parser.parse_args(argv)
+
+    args.tools = [tool.strip() for tool in args.tools.split(',') if tool.strip()]
+    unknown = [tool for tool in args.tools if tool not in TOOL_CALLS]
+    if unknown:
+        parser.error(f"unknown tools: {', '.join(unknown)}")
+    args.concurrency = [int(level) for level in args.concurrency.split(',')]
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
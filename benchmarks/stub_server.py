@@ -0,0 +1,216 @@
+import copy
+import json
+import os
+import random
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_fixture(name: str) -> dict:
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as fixture_file:
+        return json.load(fixture_file)
+
+
+class StubConfig:
+    """
+    Simulated upstream behaviour shared by every stand-in endpoint.
+
+    Args:
+        latency_ms (float): Median response latency in milliseconds
+        jitter (float): Log-normal sigma applied to the latency (0 = constant)
+        error_rate (float): Share of requests answered with a 500 or 429
+        rate_limit (float): Requests per second each provider (Amadeus, RapidAPI) accepts before answering 429 (0 = unlimited)
+    """
+
+    def __init__(self, latency_ms: float = 50.0, jitter: float = 0.5, error_rate: float = 0.0, rate_limit: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+
+    def delay(self) -> float:
+        factor = random.lognormvariate(0, self.jitter) if self.jitter else 1.0
+        return self.latency_ms * factor / 1000
+
+
+class StubUpstream:
+    """
+    Replays the recorded fixtures for Amadeus, Open-Meteo and RapidAPI from one local HTTP server.
+
+    Hotel offers are filtered to the requested hotel IDs and forecasts are cut
+    to the requested date window, so the tools see responses shaped like the
+    real providers' for any arguments.
+
+    Args:
+        config (StubConfig): Latency and error simulation settings
+    """
+
+    def __init__(self, config: Optional[StubConfig] = None):
+        self.config = config or StubConfig()
+        self.requests: Dict[str, int] = {}
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+        self._fixtures = {
+            'token': load_fixture('amadeus_token.json'),
+            'flights': load_fixture('flight_offers.json'),
+            'hotels_by_city': load_fixture('hotels_by_city.json'),
+            'geocode': load_fixture('geocode.json'),
+            'forecast': load_fixture('forecast.json'),
+            'cars': load_fixture('car_rentals.json'),
+        }
+        self._hotel_offers = {group['hotel']['hotelId']: group for group in load_fixture('hotel_offers.json')['data']}
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> 'StubUpstream':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stub-upstream', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def count(self, route: str):
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def admit(self, route: str) -> bool:
+        """
+        Apply the simulated provider rate limit to one request.
+
+        Returns:
+            bool: False if the request exceeds the limit and must be answered with 429
+        """
+        provider = route.split('_')[0]
+        if not self.config.rate_limit or provider not in ('amadeus', 'rapidapi') or route == 'amadeus_token':
+            return True
+        with self._lock:
+            now = time.monotonic()
+            next_slot = self._next_slot.get(provider, 0.0)
+            if next_slot > now:
+                self.rate_limited += 1
+                return False
+            self._next_slot[provider] = max(next_slot, now - 1) + 1 / self.config.rate_limit
+            return True
+
+    def respond(self, path: str, query: Dict[str, str], body: bytes = b'') -> tuple:
+        if path == '/v1/security/oauth2/token':
+            return 'amadeus_token', 200, self._fixtures['token'], 'application/json'
+        if path == '/v2/shopping/flight-offers' and body:
+            return 'amadeus_itineraries', 200, self._itinerary_offers(json.loads(body)), 'application/vnd.amadeus+json'
+        if path == '/v2/shopping/flight-offers':
+            return 'amadeus_flights', 200, self._fixtures['flights'], 'application/vnd.amadeus+json'
+        if path == '/v1/reference-data/locations/hotels/by-city':
+            return 'amadeus_hotels_by_city', 200, self._fixtures['hotels_by_city'], 'application/vnd.amadeus+json'
+        if path == '/v3/shopping/hotel-offers':
+            ids = query.get('hotelIds', '').split(',')
+            data = [self._hotel_offers[hotel_id] for hotel_id in ids if hotel_id in self._hotel_offers]
+            return 'amadeus_hotel_offers', 200, {'data': data}, 'application/vnd.amadeus+json'
+        if path == '/v1/search':
+            return 'open_meteo_geocode', 200, self._fixtures['geocode'], 'application/json'
+        if path == '/v1/forecast':
+            return 'open_meteo_forecast', 200, self._forecast(query), 'application/json'
+        if path == '/api/v1/cars/searchCarRentals':
+            return 'rapidapi_cars', 200, self._fixtures['cars'], 'application/json'
+        return 'unknown', 404, {'error': f'No stub for {path}'}, 'application/json'
+
+    def _itinerary_offers(self, search: dict) -> dict:
+        legs = search['originDestinations']
+        travelers = search.get('travelers') or [{'id': '1', 'travelerType': 'ADULT'}]
+        recorded = self._fixtures['flights']
+        offers = []
+        for recorded_offer in recorded['data']:
+            offer = copy.deepcopy(recorded_offer)
+            template = offer['itineraries'][0]
+            offer['itineraries'] = [self._retarget(template, leg) for leg in legs]
+            fare = float(offer['price']['total']) * len(legs)
+            offer['price']['total'] = offer['price']['grandTotal'] = f"{fare * len(travelers):.2f}"
+            pricing = offer['travelerPricings'][0]
+            pricing['price']['total'] = f"{fare:.2f}"
+            offer['travelerPricings'] = [{**pricing, 'travelerId': traveler['id']} for traveler in travelers]
+            offers.append(offer)
+        return {**recorded, 'data': offers}
+
+    def _retarget(self, itinerary: dict, leg: dict) -> dict:
+        itinerary = copy.deepcopy(itinerary)
+        segments = itinerary['segments']
+        first_departure = datetime.fromisoformat(segments[0]['departure']['at'])
+        shift = datetime.fromisoformat(leg['departureDateTimeRange']['date']) - datetime.combine(first_departure.date(), datetime.min.time())
+        for segment in segments:
+            for end in ('departure', 'arrival'):
+                segment[end]['at'] = (datetime.fromisoformat(segment[end]['at']) + shift).isoformat()
+        segments[0]['departure']['iataCode'] = leg['originLocationCode']
+        segments[-1]['arrival']['iataCode'] = leg['destinationLocationCode']
+        return itinerary
+
+    def _forecast(self, query: Dict[str, str]) -> dict:
+        recorded = self._fixtures['forecast']
+        first_day = date.fromisoformat(query['start_date'])
+        days = (date.fromisoformat(query['end_date']) - first_day).days + 1
+        daily = {
+            field: [values[i % len(values)] for i in range(days)]
+            for field, values in recorded['daily'].items() if field != 'time'
+        }
+        daily['time'] = [(first_day + timedelta(days=i)).isoformat() for i in range(days)]
+        return {**recorded, 'daily': daily}
+
+    def _handler_class(self):
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self._serve()
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                self._serve(self.rfile.read(length))
+
+            def _serve(self, request_body: bytes = b''):
+                parts = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+                route, status, body, content_type = upstream.respond(parts.path, query, request_body)
+                upstream.count(route)
+                time.sleep(upstream.config.delay())
+
+                headers = {}
+                if not upstream.admit(route):
+                    status = 429
+                    body = {'errors': [{'status': 429, 'title': 'Too many requests'}]}
+                    headers['Retry-After'] = '1'
+                elif route != 'amadeus_token' and random.random() < upstream.config.error_rate:
+                    status = random.choice((429, 500))
+                    body = {'errors': [{'status': status, 'title': 'SIMULATED ERROR'}]}
+                    headers['Retry-After'] = '0'
+
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                try:
+                    self.wfile.write(payload)
+                except ConnectionError:
+                    # The client gave up on the request, e.g. a hedged request whose other copy answered first
+                    self.close_connection = True
+
+        return Handler
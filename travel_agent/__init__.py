@@ -1 +1,15 @@
-from . import agent
+import importlib
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def __getattr__(name):
+    # Submodules (and the ADK agents in agent.py) are imported on first use, so
+    # importing one module does not pay for the Google ADK import of the others.
+    if name == 'root_agent':
+        return importlib.import_module('.agent', __name__).root_agent
+    if name in ('agent', 'tools'):
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
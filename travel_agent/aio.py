@@ -0,0 +1,71 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import threading
+from typing import Any, Awaitable, Callable
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='travel-agent-loop', daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro: Awaitable) -> Any:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Coroutines run on one long-lived background loop, so the async HTTP client
+    and its keep-alive connections are reused across sync calls. This also works
+    when the caller is itself inside a running event loop.
+
+    Args:
+        coro (Awaitable): Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+def run_in_background(coro: Awaitable) -> concurrent.futures.Future:
+    """
+    Schedule a coroutine on the shared background loop without waiting for it.
+
+    The coroutine starts in an empty context rather than the caller's, so work
+    that outlives the call (such as prefetching) does not keep adding to its
+    offer collector or its trace.
+
+    Args:
+        coro (Awaitable): Coroutine to run
+
+    Returns:
+        concurrent.futures.Future: Future of the coroutine's result
+    """
+    return contextvars.Context().run(asyncio.run_coroutine_threadsafe, coro, _background_loop())
+
+
+def sync_tool(func: Callable) -> Callable:
+    """
+    Build a blocking wrapper around an async tool function.
+
+    Args:
+        func (Callable): Async tool function
+
+    Returns:
+        Callable: Function with the same name, signature and docstring that blocks until the result is ready
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return run_sync(func(*args, **kwargs))
+
+    return wrapper
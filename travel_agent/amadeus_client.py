@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from amadeus import Client
+from amadeus.client.access_token import AccessToken
+
+from . import transport
+
+TOKEN_REFRESH_MARGIN = int(os.getenv('AMADEUS_TOKEN_REFRESH_MARGIN', '60'))
+
+
+class SharedAccessToken(AccessToken):
+    """
+    Thread-safe Amadeus access token that refreshes ahead of expiry.
+
+    The token is refreshed TOKEN_REFRESH_MARGIN seconds before it expires. When
+    several threads find it stale at once, one of them refreshes it while the
+    others wait for that result instead of requesting their own token.
+    """
+
+    def __init__(self, client: Client):
+        super().__init__(client)
+        self._refresh_lock = threading.Lock()
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.refresh_seconds = 0.0
+        self.last_refresh_seconds = 0.0
+
+    def _bearer_token(self) -> str:
+        if self._needs_refresh():
+            with self._refresh_lock:
+                if self._needs_refresh():
+                    self._refresh()
+        return 'Bearer {0}'.format(self.access_token)
+
+    def _needs_refresh(self) -> bool:
+        return self.access_token is None or time.time() + TOKEN_REFRESH_MARGIN >= self.expires_at
+
+    def _refresh(self):
+        start = time.perf_counter()
+        try:
+            response = self.client._unauthenticated_request(
+                'POST',
+                '/v1/security/oauth2/token',
+                {
+                    'grant_type': 'client_credentials',
+                    'client_id': self.client.client_id,
+                    'client_secret': self.client.client_secret
+                }
+            )
+        except Exception:
+            self.refresh_failures += 1
+            raise
+        finally:
+            self.last_refresh_seconds = time.perf_counter() - start
+            self.refresh_seconds += self.last_refresh_seconds
+
+        data = response.result
+        self.access_token = data.get('access_token', None)
+        self.expires_at = int(time.time()) + data.get('expires_in', 0)
+        self.refreshes += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'refreshes': self.refreshes,
+            'refresh_failures': self.refresh_failures,
+            'avg_refresh_ms': round(1000 * self.refresh_seconds / self.refreshes, 1) if self.refreshes else 0.0,
+            'last_refresh_ms': round(1000 * self.last_refresh_seconds, 1),
+            'expires_in': max(0, int(self.expires_at - time.time())) if self.access_token else 0,
+        }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_amadeus() -> Client:
+    """
+    Return the shared Amadeus client, creating it on first use.
+
+    Every tool uses this one client, so they share a single access token and the
+    pooled transport. Credentials are read from AMADEUS_CLIENT_ID and
+    AMADEUS_CLIENT_SECRET when the client is first needed rather than at import.
+
+    Returns:
+        amadeus.Client: The shared client
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                client = Client(
+                    client_id=os.getenv('AMADEUS_CLIENT_ID'),
+                    client_secret=os.getenv('AMADEUS_CLIENT_SECRET'),
+                    http=transport.amadeus_http
+                )
+                client.access_token = SharedAccessToken(client)
+                _client = client
+    return _client
+
+
+def set_amadeus(client: Optional[Client]):
+    """
+    Replace the shared Amadeus client (None recreates it from the environment on next use).
+
+    Args:
+        client (amadeus.Client): Client to use, e.g. one pointed at a test host
+    """
+    global _client
+    with _client_lock:
+        if client is not None and not isinstance(getattr(client, 'access_token', None), SharedAccessToken):
+            client.access_token = SharedAccessToken(client)
+        _client = client
+
+
+def token_stats() -> Optional[Dict[str, Any]]:
+    """
+    Report access-token refresh counts and latency for the shared client.
+
+    Returns:
+        dict: Token statistics, or None if the client has not been created yet
+    """
+    client = _client
+    if client is None:
+        return None
+    return client.access_token.stats()
@@ -0,0 +1,474 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from . import tracing
+from .prefetch import get_prefetcher
+
+# Cache lifetimes per tool, declared with the tools (see registry.tool)
+TOOL_TTLS: Dict[str, float] = {}
+DEFAULT_TTL = 10 * 60
+# How long past its TTL a result may still be served while it is refreshed in the background
+STALE_TTLS: Dict[str, float] = {}
+
+MISSING = object()
+
+
+class CacheStats:
+    """
+    Thread-safe hit/miss/eviction counters shared by the cache backends.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_hits = 0
+
+    def record(self, counter: str, amount: int = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+class MemoryCache:
+    """
+    In-process LRU cache with per-entry TTLs and a bound on entries and bytes.
+
+    Values are stored as JSON text, so every hit returns a fresh copy and the
+    memory bound is measured on the serialized size. Entries stored with a
+    stale_ttl stay available to lookup() for that long after they expire.
+
+    Args:
+        max_entries (int): Maximum number of entries kept (default: 1024)
+        max_bytes (int): Maximum total size of the stored values (default: 32 MiB)
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: str) -> Any:
+        entry = self._lookup(key, allow_stale=False)
+        return entry if entry is MISSING else entry[0]
+
+    def lookup(self, key: str) -> Any:
+        """
+        Look up an entry, including one that expired less than its stale_ttl ago.
+
+        Returns:
+            tuple: (value, fresh_until), or MISSING
+        """
+        return self._lookup(key, allow_stale=True)
+
+    def _lookup(self, key: str, allow_stale: bool) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.record('misses')
+                return MISSING
+
+            fresh_until, expires_at, payload = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.stats.record('expirations')
+                self.stats.record('misses')
+                return MISSING
+            if fresh_until <= now and not allow_stale:
+                self.stats.record('misses')
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self.stats.record('hits' if fresh_until > now else 'stale_hits')
+        return json.loads(payload), fresh_until
+
+    def set(self, key: str, value: Any, ttl: float, stale_ttl: float = 0):
+        payload = json.dumps(value)
+        if len(payload) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (now + ttl, now + ttl + stale_ttl, payload)
+            self._bytes += len(payload)
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats.record('evictions')
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'backend': 'memory', 'entries': len(self._entries), 'bytes': self._bytes, **self.stats.snapshot()}
+
+    def _remove(self, key: str):
+        *_, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+
+class SQLiteCache:
+    """
+    On-disk LRU cache backed by SQLite, so cached results survive restarts.
+
+    Args:
+        path (str): Path of the SQLite database file
+        max_entries (int): Maximum number of entries kept (default: 10000)
+        max_bytes (int): Maximum total size of the stored values (default: 256 MiB)
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        import sqlite3
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, '
+            'expires_at REAL NOT NULL, accessed_at REAL NOT NULL, fresh_until REAL)'
+        )
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(cache)')}
+        if 'fresh_until' not in columns:
+            self._conn.execute('ALTER TABLE cache ADD COLUMN fresh_until REAL')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)')
+
+    def get(self, key: str) -> Any:
+        entry = self._lookup(key, allow_stale=False)
+        return entry if entry is MISSING else entry[0]
+
+    def lookup(self, key: str) -> Any:
+        """
+        Look up an entry, including one that expired less than its stale_ttl ago.
+
+        Returns:
+            tuple: (value, fresh_until), or MISSING
+        """
+        return self._lookup(key, allow_stale=True)
+
+    def _lookup(self, key: str, allow_stale: bool) -> Any:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at, COALESCE(fresh_until, expires_at) FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.record('misses')
+                return MISSING
+
+            payload, expires_at, fresh_until = row
+            if expires_at <= now:
+                self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self.stats.record('expirations')
+                self.stats.record('misses')
+                return MISSING
+            if fresh_until <= now and not allow_stale:
+                self.stats.record('misses')
+                return MISSING
+
+            self._conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+            self.stats.record('hits' if fresh_until > now else 'stale_hits')
+        return json.loads(payload), fresh_until
+
+    def set(self, key: str, value: Any, ttl: float, stale_ttl: float = 0):
+        payload = json.dumps(value)
+        if len(payload) > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, size, expires_at, accessed_at, fresh_until) VALUES (?, ?, ?, ?, ?, ?)',
+                (key, payload, len(payload), now + ttl + stale_ttl, now, now + ttl)
+            )
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM cache')
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        return {'backend': 'sqlite', 'path': self.path, 'entries': entries, 'bytes': size, **self.stats.snapshot()}
+
+    def _evict(self):
+        entries, size = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        while entries > self.max_entries or size > self.max_bytes:
+            row = self._conn.execute('SELECT key, size FROM cache ORDER BY accessed_at LIMIT 1').fetchone()
+            if row is None:
+                break
+            self._conn.execute('DELETE FROM cache WHERE key = ?', (row[0],))
+            self.stats.record('evictions')
+            entries -= 1
+            size -= row[1]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    Return the shared tool cache, creating it from the environment on first use.
+
+    TRAVEL_AGENT_CACHE selects the backend ('memory', 'sqlite' or 'off'),
+    TRAVEL_AGENT_CACHE_PATH sets the SQLite file and
+    TRAVEL_AGENT_CACHE_MAX_ENTRIES / TRAVEL_AGENT_CACHE_MAX_BYTES bound its size.
+
+    Returns:
+        The cache backend, or None when caching is turned off
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _cache_from_env()
+    return _cache if _cache is not False else None
+
+
+def set_cache(cache):
+    """
+    Replace the shared tool cache (pass None to turn caching off).
+
+    Args:
+        cache: A MemoryCache, SQLiteCache or compatible backend
+    """
+    global _cache
+    with _cache_lock:
+        _cache = cache if cache is not None else False
+
+
+def _cache_from_env():
+    backend = os.getenv('TRAVEL_AGENT_CACHE', 'memory').lower()
+    if backend == 'off':
+        return False
+
+    limits = {}
+    if os.getenv('TRAVEL_AGENT_CACHE_MAX_ENTRIES'):
+        limits['max_entries'] = int(os.getenv('TRAVEL_AGENT_CACHE_MAX_ENTRIES'))
+    if os.getenv('TRAVEL_AGENT_CACHE_MAX_BYTES'):
+        limits['max_bytes'] = int(os.getenv('TRAVEL_AGENT_CACHE_MAX_BYTES'))
+
+    if backend == 'sqlite':
+        path = os.path.expanduser(os.getenv('TRAVEL_AGENT_CACHE_PATH', '~/.cache/travel_agent/tools.sqlite3'))
+        return SQLiteCache(path, **limits)
+    return MemoryCache(**limits)
+
+
+def set_cache_policy(tool_name: str, ttl: float, stale_ttl: float = 0):
+    """
+    Set how long a tool's results are cached and how long past that they may be served stale.
+
+    Args:
+        tool_name (str): Name of the tool function (e.g., 'check_flights')
+        ttl (float): Time to live in seconds
+        stale_ttl (float): Grace period in seconds (0 to never serve stale results)
+    """
+    TOOL_TTLS[tool_name] = ttl
+    if stale_ttl:
+        STALE_TTLS[tool_name] = stale_ttl
+    else:
+        STALE_TTLS.pop(tool_name, None)
+
+
+def tool_ttl(tool_name: str) -> float:
+    """
+    Look up the TTL for a tool, honouring a CACHE_TTL_<TOOL_NAME> override.
+
+    Args:
+        tool_name (str): Name of the tool function (e.g., 'check_flights')
+
+    Returns:
+        float: Time to live in seconds
+    """
+    override = os.getenv(f'CACHE_TTL_{tool_name.upper()}')
+    if override:
+        return float(override)
+    return TOOL_TTLS.get(tool_name, DEFAULT_TTL)
+
+
+def stale_ttl(tool_name: str) -> float:
+    """
+    Look up how long past its TTL a tool's result may be served while it is refreshed,
+    honouring a CACHE_STALE_<TOOL_NAME> override.
+
+    Args:
+        tool_name (str): Name of the tool function (e.g., 'check_flights')
+
+    Returns:
+        float: Grace period in seconds (0 for tools whose results are never served stale)
+    """
+    override = os.getenv(f'CACHE_STALE_{tool_name.upper()}')
+    if override:
+        return float(override)
+    return STALE_TTLS.get(tool_name, 0)
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip().casefold()
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    return str(value)
+
+
+def make_key(tool_name: str, signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    """
+    Build a cache key from a tool call, normalizing argument case, spacing and defaults.
+
+    Args:
+        tool_name (str): Name of the tool function
+        signature (inspect.Signature): Signature of the tool function
+        args (tuple): Positional arguments of the call
+        kwargs (dict): Keyword arguments of the call
+
+    Returns:
+        str: Key that is equal for calls that ask the same question
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return f"{tool_name}:{arguments_key(bound.arguments)}"
+
+
+def arguments_key(arguments: Dict[str, Any]) -> str:
+    """
+    Serialize tool arguments so that calls asking the same question compare equal.
+
+    The ADK tool_context argument is left out: it differs on every call and does not change the answer.
+
+    Args:
+        arguments (dict): Argument values keyed by parameter name
+
+    Returns:
+        str: JSON of the normalized arguments
+    """
+    normalized = {name: _normalize(value) for name, value in arguments.items() if name != 'tool_context'}
+    return json.dumps(normalized, sort_keys=True)
+
+
+def cached_tool(func: Callable, name: Optional[str] = None) -> Callable:
+    """
+    Cache successful results of a tool function in the shared tool cache.
+
+    Only results with status 'success' are stored, so errors are always retried;
+    results marked 'partial' (some providers missing) are not stored either.
+
+    For tools with a stale TTL (see STALE_TTLS), a result that expired less
+    than that long ago is still returned at once while it is refreshed in
+    the background, and every call is reported to the prefetcher so popular
+    calls are refreshed before they expire.
+
+    Args:
+        func (Callable): Async tool function returning a result dict
+        name (str): Cache policy and key prefix to use instead of the function's name
+
+    Returns:
+        Callable: Wrapped function with the same name, signature and docstring
+    """
+    signature = inspect.signature(func)
+    tool_name = name or func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        cache = get_cache()
+        if cache is None:
+            return await func(*args, **kwargs)
+
+        key = make_key(tool_name, signature, args, kwargs)
+        grace = stale_ttl(tool_name)
+        if not grace:
+            result = cache.get(key)
+            tracing.annotate(cache='miss' if result is MISSING else 'hit')
+            if result is not MISSING:
+                return result
+
+            result = await func(*args, **kwargs)
+            _store(cache, key, tool_name, result)
+            return result
+
+        async def refresh():
+            return _store(cache, key, tool_name, await func(*args, **kwargs), grace)
+
+        prefetcher = get_prefetcher()
+        entry = cache.lookup(key)
+        if entry is not MISSING:
+            result, fresh_until = entry
+            if fresh_until > time.time():
+                tracing.annotate(cache='hit')
+            else:
+                tracing.annotate(cache='stale')
+                prefetcher.revalidate(key, refresh)
+            prefetcher.record(key, refresh, fresh_until)
+            return result
+
+        tracing.annotate(cache='miss')
+        result = await func(*args, **kwargs)
+        fresh_until = _store(cache, key, tool_name, result, grace)
+        if fresh_until is not None:
+            prefetcher.record(key, refresh, fresh_until)
+        return result
+
+    return wrapper
+
+
+def _store(cache, key: str, tool_name: str, result: Any, grace: float = 0) -> Optional[float]:
+    if isinstance(result, dict) and result.get('status') == 'success' and not result.get('partial'):
+        ttl = tool_ttl(tool_name)
+        cache.set(key, result, ttl, grace)
+        return time.time() + ttl
+    return None
+
+
+def cache_stats() -> Optional[Dict[str, Any]]:
+    """
+    Report size and hit/miss/eviction counters of the shared tool cache.
+
+    Returns:
+        dict: Cache statistics, or None when caching is turned off
+    """
+    cache = get_cache()
+    return cache.info() if cache is not None else None
@@ -0,0 +1,137 @@
+import os
+import threading
+from typing import Awaitable, Callable, Dict, List, NamedTuple
+
+from . import tracing, transport
+from .records import CarRental
+
+DEFAULT_DEADLINE = 6.0
+
+
+class CarRentalQuery(NamedTuple):
+    pickup_location: str
+    pickup_date: str
+    pickup_time: str
+    dropoff_date: str
+    dropoff_time: str
+
+
+class CarProviderError(Exception):
+    """
+    A car rental provider answered, but not with results.
+    """
+
+
+class CarProvider(NamedTuple):
+    """
+    A car rental backend searched by check_car_rentals.
+
+    Args:
+        name (str): Name used in settings and partial-result notes (e.g., 'booking')
+        search (Callable): Coroutine function taking a CarRentalQuery (dates in YYYY-MM-DD) and returning every offer found
+        deadline (float): Seconds from the start of a search after which the provider's offers are left out, if another provider has answered
+    """
+    name: str
+    search: Callable[[CarRentalQuery], Awaitable[List[CarRental]]]
+    deadline: float
+
+
+async def search_booking(query: CarRentalQuery) -> List[CarRental]:
+    """
+    Search the Booking.com car rental API on RapidAPI (booking-com15).
+
+    Args:
+        query (CarRentalQuery): Pickup location, dates in format YYYY-MM-DD and times
+
+    Returns:
+        List[CarRental]: Every result, in provider order (empty if there are none)
+
+    Raises:
+        CarProviderError: If the API answers with an error status
+    """
+    url = "https://booking-com15.p.rapidapi.com/api/v1/cars/searchCarRentals"
+
+    headers = {
+        "x-rapidapi-key": os.getenv('RAPIDAPI_KEY'),
+        "x-rapidapi-host": "booking-com15.p.rapidapi.com"
+    }
+
+    params = {
+        "pick_up_location": query.pickup_location,
+        "pick_up_date": query.pickup_date,
+        "pick_up_time": query.pickup_time,
+        "drop_off_date": query.dropoff_date,
+        "drop_off_time": query.dropoff_time,
+        "currency_code": "USD"
+    }
+
+    response = await transport.async_get(url, headers=headers, params=params)
+    with tracing.span('decode_response'):
+        data = response.json()
+
+    if response.status_code != 200:
+        raise CarProviderError(f"API request failed: {response.status_code}")
+
+    results = (data.get('data') or {}).get('search_results') or []
+    with tracing.span('parse_response', results=len(results)):
+        return [CarRental.from_rapidapi(car) for car in results]
+
+
+BUILTIN_PROVIDERS = {
+    'booking': search_booking,
+}
+
+_providers: Dict[str, CarProvider] = {}
+_providers_lock = threading.Lock()
+_configured = False
+
+
+def _default_deadline() -> float:
+    return float(os.getenv('TRAVEL_AGENT_CAR_PROVIDER_DEADLINE', str(DEFAULT_DEADLINE)))
+
+
+def register_car_provider(name: str, search: Callable[[CarRentalQuery], Awaitable[List[CarRental]]], deadline: float = 0):
+    """
+    Add a car rental backend, or replace the one with the same name (for example with a local fake).
+
+    Args:
+        name (str): Provider name
+        search (Callable): Coroutine function taking a CarRentalQuery and returning CarRental offers
+        deadline (float): Seconds to wait for it (default: TRAVEL_AGENT_CAR_PROVIDER_DEADLINE)
+    """
+    with _providers_lock:
+        _providers[name] = CarProvider(name, search, deadline or _default_deadline())
+
+
+def unregister_car_provider(name: str):
+    with _providers_lock:
+        _providers.pop(name, None)
+
+
+def car_providers() -> List[CarProvider]:
+    """
+    The car rental backends to search, adding the configured built-in ones on first use.
+
+    TRAVEL_AGENT_CAR_PROVIDERS lists the built-in providers to use (default
+    'booking', empty for none); TRAVEL_AGENT_CAR_PROVIDER_DEADLINE sets how
+    many seconds each one gets once another one has answered (default 6).
+
+    Returns:
+        List[CarProvider]: Every registered provider
+
+    Raises:
+        ValueError: If the setting names an unknown provider
+    """
+    global _configured
+    if not _configured:
+        names = [name.strip().lower() for name in os.getenv('TRAVEL_AGENT_CAR_PROVIDERS', 'booking').split(',') if name.strip()]
+        unknown = [name for name in names if name not in BUILTIN_PROVIDERS]
+        if unknown:
+            raise ValueError(f"Unknown TRAVEL_AGENT_CAR_PROVIDERS entries: {', '.join(unknown)}. Use any of: {', '.join(BUILTIN_PROVIDERS)}")
+        with _providers_lock:
+            if not _configured:
+                for name in names:
+                    _providers.setdefault(name, CarProvider(name, BUILTIN_PROVIDERS[name], _default_deadline()))
+                _configured = True
+    with _providers_lock:
+        return list(_providers.values())
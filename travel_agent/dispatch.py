@@ -0,0 +1,53 @@
+import asyncio
+import time
+from typing import Any, Dict
+
+from google.adk.tools import AgentTool, ToolContext
+
+from . import tracing
+
+
+async def _run_timed(agent_tool: AgentTool, request: str, tool_context: ToolContext) -> tuple:
+    start = time.perf_counter()
+    with tracing.span(f"agent {agent_tool.name}", request=request) as current:
+        try:
+            result = await agent_tool.run_async(args={'request': request}, tool_context=tool_context)
+        except Exception as e:
+            result = {"status": "error", "error": f"{agent_tool.name} failed: {str(e)}"}
+            if current is not None:
+                current.set_status('error', result['error'])
+    return result, round(time.perf_counter() - start, 2)
+
+
+async def dispatch_parallel(requests: Dict[str, str], agent_tools: Dict[str, AgentTool], tool_context: ToolContext) -> Dict[str, Any]:
+    """
+    Run independent sub-agent requests concurrently and merge their answers.
+
+    Every non-empty request is sent to its sub-agent at the same time, so the
+    total wait is close to the slowest sub-agent instead of the sum of all of
+    them. A sub-agent that fails is reported in its own slot without affecting
+    the others.
+
+    Args:
+        requests (Dict[str, str]): Request text keyed by sub-agent name (empty requests are skipped)
+        agent_tools (Dict[str, AgentTool]): AgentTool for each sub-agent name
+        tool_context (ToolContext): Context of the calling tool, shared with the sub-agents
+
+    Returns:
+        dict: Dictionary with 'status', 'results' (answer per sub-agent) and 'elapsed_seconds' per sub-agent
+    """
+    pending = {name: request.strip() for name, request in requests.items() if request and request.strip()}
+    if not pending:
+        return {"status": "error", "error": "No requests were provided"}
+
+    outcomes = await asyncio.gather(*(
+        _run_timed(agent_tools[name], request, tool_context) for name, request in pending.items()
+    ))
+
+    results = {}
+    elapsed = {}
+    for name, (result, seconds) in zip(pending, outcomes):
+        results[name] = result
+        elapsed[name] = seconds
+
+    return {"status": "success", "results": results, "elapsed_seconds": elapsed}
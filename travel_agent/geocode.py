@@ -0,0 +1,154 @@
+import os
+import threading
+import unicodedata
+from typing import Dict, NamedTuple, Optional
+
+from . import tracing, transport
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), 'data', 'gazetteer.tsv')
+GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
+
+
+class Place(NamedTuple):
+    latitude: float
+    longitude: float
+    name: str
+    country: str
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a city name for index lookups (case, accents and spacing are ignored).
+
+    Args:
+        name (str): City name as typed by the user (e.g., ' Zürich ')
+
+    Returns:
+        str: Normalized key (e.g., 'zurich')
+    """
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.casefold().split())
+
+
+class GeocodeIndex:
+    """
+    Local index of city name -> coordinates, checked before the geocoding API.
+
+    Entries are kept in a tab-separated file with one place per line, which is
+    compact and loads with a single split per line. New lookups are appended,
+    so the file grows from past lookups without being rewritten.
+
+    Args:
+        path (str): File the index is loaded from and appended to (None keeps it in memory)
+        gazetteer_path (str): Optional bundled gazetteer to preload
+    """
+
+    def __init__(self, path: Optional[str] = None, gazetteer_path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._places: Dict[str, Place] = {}
+
+        if gazetteer_path:
+            self._load(gazetteer_path)
+        if path:
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+    def lookup(self, name: str) -> Optional[Place]:
+        return self._places.get(normalize_name(name))
+
+    def add(self, name: str, place: Place):
+        key = normalize_name(name)
+        with self._lock:
+            if self._places.get(key) == place:
+                return
+            self._places[key] = place
+            if self.path:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as index_file:
+                    index_file.write(_format_line(key, place))
+
+    def _load(self, path: str):
+        if not os.path.exists(path):
+            return
+        with open(path, encoding='utf-8') as index_file:
+            for line in index_file:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                try:
+                    key, latitude, longitude, name, country = line.rstrip('\n').split('\t')
+                    place = Place(float(latitude), float(longitude), name, country)
+                except ValueError:
+                    # A line cut short by a crash or by concurrent appends; the place is looked up again when needed
+                    continue
+                self._places[normalize_name(key)] = place
+
+
+def _format_line(key: str, place: Place) -> str:
+    fields = (key, repr(place.latitude), repr(place.longitude), place.name, place.country)
+    return '\t'.join(field.replace('\t', ' ').replace('\n', ' ') for field in fields) + '\n'
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_geocode_index() -> GeocodeIndex:
+    """
+    Return the shared geocode index, loading it on first use.
+
+    TRAVEL_AGENT_GEOCODE_PATH sets the index file (default ~/.cache/travel_agent/geocode.tsv,
+    'off' keeps it in memory only) and TRAVEL_AGENT_GAZETTEER=off skips the bundled gazetteer.
+
+    Returns:
+        GeocodeIndex: The shared index
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = os.getenv('TRAVEL_AGENT_GEOCODE_PATH', '~/.cache/travel_agent/geocode.tsv')
+                path = None if path.lower() == 'off' else os.path.expanduser(path)
+                gazetteer = None if os.getenv('TRAVEL_AGENT_GAZETTEER', '').lower() == 'off' else GAZETTEER_PATH
+                _index = GeocodeIndex(path, gazetteer)
+    return _index
+
+
+async def geocode(location: str) -> Optional[Place]:
+    """
+    Resolve a city name to coordinates, using the local index before the Open-Meteo geocoder.
+
+    Args:
+        location (str): City name (e.g., 'Paris')
+
+    Returns:
+        Place: Coordinates, display name and country, or None if the city is unknown
+
+    Raises:
+        httpx.HTTPError: If the geocoding service cannot be reached
+    """
+    index = get_geocode_index()
+    place = index.lookup(location)
+    tracing.annotate(geocode='index' if place is not None else 'upstream')
+    if place is not None:
+        return place
+
+    geo_response = await transport.async_get(GEOCODE_URL, params=_geocode_params(location))
+    return _store_result(index, location, geo_response.json())
+
+
+def _geocode_params(location: str) -> Dict[str, object]:
+    return {'name': location, 'count': 1, 'language': 'en', 'format': 'json'}
+
+
+def _store_result(index: GeocodeIndex, location: str, geo_data: dict) -> Optional[Place]:
+    if not geo_data.get('results'):
+        return None
+
+    result = geo_data['results'][0]
+    place = Place(result['latitude'], result['longitude'], result['name'], result.get('country', ''))
+    index.add(location, place)
+    return place
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from . import tracing
+from .amadeus_client import get_amadeus
+
+HOTELS_PER_CITY = 100
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+RECENT_OFFER_WINDOW = 3 * 24 * 60 * 60
+COMPACT_AFTER_LINES = 1000
+
+logger = logging.getLogger('travel_agent.hotel_catalog')
+
+
+class CityHotels(NamedTuple):
+    hotel_ids: Tuple[str, ...]
+    fetched_at: float
+
+
+class HotelCatalog:
+    """
+    Local index of city code -> Amadeus hotel IDs, checked before the hotel list API.
+
+    The hotel list of a city barely changes, so it is kept for max_age seconds
+    and refreshed in the background after that. The catalog also remembers when
+    each hotel last returned offers, so searches can query the hotels that
+    recently had rooms before the ones that did not.
+
+    Entries are kept in a tab-separated file with the entry type in the first
+    column. Offer sightings are appended as they happen; the file is rewritten
+    (dropping old sightings) whenever a city's hotel list is stored, or once
+    COMPACT_AFTER_LINES appended sightings replace earlier ones.
+
+    Args:
+        path (str): File the catalog is loaded from and saved to (None keeps it in memory)
+        max_age (float): Seconds before a city's hotel list is refreshed
+    """
+
+    def __init__(self, path: Optional[str] = None, max_age: float = DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._cities: Dict[str, CityHotels] = {}
+        self._last_offer: Dict[str, float] = {}
+        self._superseded = 0
+
+        if path:
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._cities)
+
+    def lookup(self, city_code: str) -> Optional[CityHotels]:
+        return self._cities.get(city_code.upper())
+
+    def is_stale(self, entry: CityHotels, now: Optional[float] = None) -> bool:
+        return (now or time.time()) - entry.fetched_at >= self.max_age
+
+    def ranked(self, city_code: str, now: Optional[float] = None) -> List[str]:
+        """
+        Hotel IDs of a city, with the hotels that returned offers recently first.
+
+        Args:
+            city_code (str): IATA city code (e.g., 'PAR')
+            now (float): Current time (default: time.time())
+
+        Returns:
+            List[str]: Recently productive hotels (most recent first), then the rest in catalog order
+        """
+        entry = self.lookup(city_code)
+        if entry is None:
+            return []
+        cutoff = (now or time.time()) - RECENT_OFFER_WINDOW
+        recent = {hotel_id: self._last_offer[hotel_id] for hotel_id in entry.hotel_ids if self._last_offer.get(hotel_id, 0) >= cutoff}
+        productive = sorted(recent, key=recent.get, reverse=True)
+        return productive + [hotel_id for hotel_id in entry.hotel_ids if hotel_id not in recent]
+
+    def store(self, city_code: str, hotel_ids: Iterable[str], fetched_at: Optional[float] = None):
+        with self._lock:
+            self._cities[city_code.upper()] = CityHotels(tuple(hotel_ids)[:HOTELS_PER_CITY], fetched_at or time.time())
+            if self.path:
+                self._save()
+
+    def record_offers(self, hotel_ids: Iterable[str], now: Optional[float] = None):
+        """
+        Remember that these hotels just returned offers.
+
+        Args:
+            hotel_ids (Iterable[str]): Amadeus hotel IDs that had at least one offer
+            now (float): Time of the search (default: time.time())
+        """
+        seen_at = now or time.time()
+        with self._lock:
+            lines = []
+            for hotel_id in hotel_ids:
+                self._superseded += hotel_id in self._last_offer
+                self._last_offer[hotel_id] = seen_at
+                lines.append(f"offer\t{hotel_id}\t{seen_at!r}\n")
+            if not self.path or not lines:
+                return
+            if self._superseded >= COMPACT_AFTER_LINES:
+                self._save()
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as catalog_file:
+                catalog_file.writelines(lines)
+
+    def _load(self, path: str):
+        if not os.path.exists(path):
+            return
+        with open(path, encoding='utf-8') as catalog_file:
+            for line in catalog_file:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                try:
+                    kind, key, *fields = line.rstrip('\n').split('\t')
+                    if kind == 'city':
+                        fetched_at, hotel_ids = fields
+                        self._cities[key] = CityHotels(tuple(hotel_ids.split(',')) if hotel_ids else (), float(fetched_at))
+                    elif kind == 'offer':
+                        self._superseded += key in self._last_offer
+                        self._last_offer[key] = float(fields[0])
+                except (ValueError, IndexError):
+                    # A damaged line; that city's hotels are listed again on its next search
+                    continue
+
+    def _save(self):
+        cutoff = time.time() - RECENT_OFFER_WINDOW
+        self._last_offer = {hotel_id: seen_at for hotel_id, seen_at in self._last_offer.items() if seen_at >= cutoff}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as catalog_file:
+            for city_code, entry in self._cities.items():
+                catalog_file.write(f"city\t{city_code}\t{entry.fetched_at!r}\t{','.join(entry.hotel_ids)}\n")
+            for hotel_id, seen_at in self._last_offer.items():
+                catalog_file.write(f"offer\t{hotel_id}\t{seen_at!r}\n")
+        os.replace(temporary_path, self.path)
+        self._superseded = 0
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+_refreshes: Dict[str, asyncio.Task] = {}
+
+
+def get_hotel_catalog() -> HotelCatalog:
+    """
+    Return the shared hotel catalog, loading it on first use.
+
+    TRAVEL_AGENT_HOTEL_CATALOG_PATH sets the catalog file (default
+    ~/.cache/travel_agent/hotel_catalog.tsv, 'off' keeps it in memory only) and
+    TRAVEL_AGENT_HOTEL_CATALOG_MAX_AGE how many seconds a city's hotel list is
+    used before it is refreshed (default one week).
+
+    Returns:
+        HotelCatalog: The shared catalog
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                path = os.getenv('TRAVEL_AGENT_HOTEL_CATALOG_PATH', '~/.cache/travel_agent/hotel_catalog.tsv')
+                path = None if path.lower() == 'off' else os.path.expanduser(path)
+                max_age = float(os.getenv('TRAVEL_AGENT_HOTEL_CATALOG_MAX_AGE', str(DEFAULT_MAX_AGE)))
+                _catalog = HotelCatalog(path, max_age)
+    return _catalog
+
+
+async def hotel_ids_for_city(city_code: str) -> List[str]:
+    """
+    Hotel IDs to search in a city, from the catalog when it has them.
+
+    A city that is not in the catalog yet is fetched from the Amadeus hotel
+    list API before returning; a stale one is returned as-is and refreshed in
+    the background. Concurrent fetches of the same city share one request.
+
+    Args:
+        city_code (str): IATA city code (e.g., 'PAR')
+
+    Returns:
+        List[str]: Hotel IDs, recently productive hotels first (empty if the city has no hotels)
+
+    Raises:
+        amadeus.ResponseError: If the city is not in the catalog and the hotel list request fails
+    """
+    catalog = get_hotel_catalog()
+    city_code = city_code.upper()
+    entry = catalog.lookup(city_code)
+    if entry is None:
+        tracing.annotate(hotel_catalog='upstream')
+        await asyncio.shield(_refresh(catalog, city_code))
+    elif catalog.is_stale(entry):
+        tracing.annotate(hotel_catalog='stale')
+        _refresh(catalog, city_code).add_done_callback(_log_failed_refresh)
+    else:
+        tracing.annotate(hotel_catalog='index')
+    return catalog.ranked(city_code)
+
+
+def _refresh(catalog: HotelCatalog, city_code: str) -> asyncio.Task:
+    task = _refreshes.get(city_code)
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_fetch_city(catalog, city_code))
+        _refreshes[city_code] = task
+        task.add_done_callback(lambda done: _refreshes.pop(city_code, None) if _refreshes.get(city_code) is done else None)
+    return task
+
+
+async def _fetch_city(catalog: HotelCatalog, city_code: str):
+    with tracing.span('amadeus hotels_by_city', city=city_code):
+        response = await asyncio.to_thread(get_amadeus().reference_data.locations.hotels.by_city.get, cityCode=city_code)
+    hotel_ids = [hotel['hotelId'] for hotel in response.data or []]
+    if hotel_ids:
+        catalog.store(city_code, hotel_ids)
+
+
+def _log_failed_refresh(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background hotel catalog refresh failed: %s", task.exception())
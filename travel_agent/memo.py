@@ -0,0 +1,143 @@
+import contextvars
+import functools
+import inspect
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from . import tracing
+from .cache import arguments_key
+
+MEMO_ENTRIES = 3
+STATE_PREFIX = 'travel_agent_memo:'
+OFFERS_KEY = 'memo_offers'
+
+Answer = Callable[[List[Any], bool, Dict[str, Any]], Optional[dict]]
+
+
+class OfferCollector:
+    """
+    The raw, unfiltered offers a tool call received from its provider.
+
+    Search functions add every offer they parse, before price or other filters
+    are applied, and clear `complete` when they stopped before seeing all of
+    them (for example after an early stop).
+    """
+
+    def __init__(self):
+        self.offers: List[Any] = []
+        self.complete = True
+
+    def add(self, records: Iterable[Any]):
+        self.offers.extend(records)
+
+
+_collector: contextvars.ContextVar[Optional[OfferCollector]] = contextvars.ContextVar('offer_collector', default=None)
+
+
+def current_collector() -> Optional[OfferCollector]:
+    """
+    Collector of the session_memo call in progress.
+
+    Returns:
+        OfferCollector: Where to add raw offers, or None if the call is not memoized
+    """
+    return _collector.get()
+
+
+def collect_offers(func: Callable) -> Callable:
+    """
+    Attach the raw offers a tool call collected to its result, under OFFERS_KEY.
+
+    This wraps the tool function itself, inside the result cache and request
+    coalescing, so the offers are cached and shared along with the result and
+    a cache hit or a coalesced call can fill the session memo too. session_memo
+    removes them again before the result reaches the caller.
+
+    Args:
+        func (Callable): Async tool function whose search adds to current_collector()
+
+    Returns:
+        Callable: Wrapped function with the same name, signature and docstring
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        collector = OfferCollector()
+        token = _collector.set(collector)
+        try:
+            result = await func(*args, **kwargs)
+        finally:
+            _collector.reset(token)
+        if not collector.offers or not isinstance(result, dict):
+            return result
+        return {**result, OFFERS_KEY: {'offers': [offer.to_state() for offer in collector.offers], 'complete': collector.complete}}
+
+    return wrapper
+
+
+def _split_offers(result: Any) -> tuple:
+    # (result without OFFERS_KEY, memo entry or None); a new dict, as the result may be shared with other callers
+    if not isinstance(result, dict) or OFFERS_KEY not in result:
+        return result, None
+    return {key: value for key, value in result.items() if key != OFFERS_KEY}, result[OFFERS_KEY]
+
+
+def session_memo(record_type: type, refinements: Sequence[str], answer: Answer) -> Callable:
+    """
+    Keep a tool's raw offers in the ADK session state and answer narrower follow-ups from them.
+
+    Within one conversation users often repeat a search with a tighter price,
+    another sort order or one airline. The raw offers of each search (attached
+    to its result by collect_offers, whether it came from the provider, the
+    cache or a coalesced call) are stored in the session state under
+    STATE_PREFIX + the tool name, keyed by the arguments that were sent
+    upstream (every argument except the refinements). A later call that only
+    changes refinements is given to `answer` with the stored offers; if it
+    returns a result, no upstream call is made. The state travels with the
+    session, so every sub-agent of the conversation shares the memo. The last
+    MEMO_ENTRIES searches are kept per tool.
+
+    Calls without a tool_context (outside an agent) are passed straight through,
+    without the raw offers.
+
+    Args:
+        record_type (type): Record class of the offers, with to_state() and from_state()
+        refinements (Sequence[str]): Arguments that are applied to the offers locally
+        answer (Answer): answer(offers, complete, arguments) returns the tool result, or None if the memo cannot answer
+
+    Returns:
+        Callable: Decorator for async tool functions wrapped with collect_offers that take a tool_context argument
+    """
+    def decorate(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        state_key = STATE_PREFIX + func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            tool_context = kwargs.pop('tool_context', None)
+            if tool_context is None:
+                return _split_offers(await func(*args, **kwargs))[0]
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {name: value for name, value in bound.arguments.items() if name != 'tool_context'}
+            search_key = arguments_key({name: value for name, value in arguments.items() if name not in refinements})
+
+            memo = tool_context.state.get(state_key) or {}
+            entry = memo.get(search_key)
+            if entry is not None:
+                result = answer([record_type.from_state(offer) for offer in entry['offers']], entry['complete'], arguments)
+                if result is not None:
+                    tracing.annotate(memo='hit')
+                    return result
+
+            tracing.annotate(memo='miss')
+            result, entry = _split_offers(await func(*args, **kwargs))
+            if entry is not None:
+                # A new dict (rather than an update in place) so ADK records the change in the state delta
+                entries = [(key, value) for key, value in memo.items() if key != search_key]
+                entries.append((search_key, entry))
+                tool_context.state[state_key] = dict(entries[-MEMO_ENTRIES:])
+            return result
+
+        return wrapper
+
+    return decorate
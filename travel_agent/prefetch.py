@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from . import tracing
+from .aio import run_in_background
+
+HALF_LIFE = 30 * 60
+MIN_SCORE = 2.0
+MAX_TRACKED = 512
+HOT_KEYS = int(os.getenv('TRAVEL_AGENT_PREFETCH_KEYS', '50'))
+REFRESH_AHEAD = float(os.getenv('TRAVEL_AGENT_PREFETCH_AHEAD', '60'))
+INTERVAL = 15.0
+
+logger = logging.getLogger('travel_agent.prefetch')
+
+Refresh = Callable[[], Awaitable[Optional[float]]]
+
+
+class _TrackedKey:
+    __slots__ = ('score', 'seen_at', 'fresh_until', 'refresh')
+
+    def __init__(self, refresh: Refresh, fresh_until: float, now: float):
+        self.score = 0.0
+        self.seen_at = now
+        self.fresh_until = fresh_until
+        self.refresh = refresh
+
+    def decayed(self, now: float) -> float:
+        return self.score * 0.5 ** ((now - self.seen_at) / HALF_LIFE)
+
+
+class Prefetcher:
+    """
+    Learns which cached tool calls are popular and refreshes them before they expire.
+
+    Every cached call of a prefetchable tool is recorded with a popularity score
+    that halves every HALF_LIFE seconds. Every INTERVAL seconds the HOT_KEYS
+    highest-scoring keys (seen at least MIN_SCORE times recently) whose cached
+    result expires within REFRESH_AHEAD seconds are refreshed in the
+    background, so users keep finding fresh results in the cache.
+
+    Scheduled refreshes are limited to budget_per_hour, so prefetching cannot
+    use up the providers' quotas. Refreshes of stale results that a user was
+    just served (see revalidate()) replace the call the user would have made
+    and are not counted against the budget.
+
+    Args:
+        budget_per_hour (int): Scheduled refreshes allowed per hour (0 turns scheduling off)
+    """
+
+    def __init__(self, budget_per_hour: int):
+        self.budget_per_hour = budget_per_hour
+        self._lock = threading.Lock()
+        self._keys: Dict[str, _TrackedKey] = {}
+        self._in_flight = set()
+        self._spent = deque()
+        self._scheduler = None
+        self.prefetched = 0
+        self.revalidated = 0
+        self.over_budget = 0
+        self.failures = 0
+
+    def record(self, key: str, refresh: Refresh, fresh_until: float):
+        """
+        Count one call of a cached tool.
+
+        Args:
+            key (str): Cache key of the call
+            refresh (Refresh): Coroutine function that reruns the call, stores the result and returns its new fresh_until
+            fresh_until (float): When the cached result stops being fresh (epoch seconds)
+        """
+        now = time.time()
+        with self._lock:
+            tracked = self._keys.get(key)
+            if tracked is None:
+                if len(self._keys) >= MAX_TRACKED:
+                    coldest = min(self._keys, key=lambda name: self._keys[name].decayed(now))
+                    del self._keys[coldest]
+                tracked = self._keys[key] = _TrackedKey(refresh, fresh_until, now)
+            tracked.score = tracked.decayed(now) + 1
+            tracked.seen_at = now
+            tracked.fresh_until = fresh_until
+            tracked.refresh = refresh
+        if self.budget_per_hour and self._scheduler is None:
+            self._start()
+
+    def revalidate(self, key: str, refresh: Refresh):
+        """
+        Refresh a stale result in the background right after it was served.
+
+        Args:
+            key (str): Cache key of the call
+            refresh (Refresh): Coroutine function that reruns the call and stores the result
+        """
+        if self._submit(key, refresh):
+            with self._lock:
+                self.revalidated += 1
+
+    def hot_keys(self, now: Optional[float] = None) -> List[str]:
+        now = now or time.time()
+        with self._lock:
+            scored = [(tracked.decayed(now), key) for key, tracked in self._keys.items()]
+        scored.sort(reverse=True)
+        return [key for score, key in scored[:HOT_KEYS] if score >= MIN_SCORE]
+
+    def tick(self, now: Optional[float] = None):
+        """
+        Refresh the hot keys that expire within REFRESH_AHEAD seconds, within the budget.
+        """
+        now = now or time.time()
+        for key in self.hot_keys(now):
+            with self._lock:
+                tracked = self._keys.get(key)
+                due = tracked is not None and tracked.fresh_until - now <= REFRESH_AHEAD and key not in self._in_flight
+                if not due:
+                    continue
+                while self._spent and self._spent[0] <= now - 3600:
+                    self._spent.popleft()
+                if len(self._spent) >= self.budget_per_hour:
+                    self.over_budget += 1
+                    return
+                self._spent.append(now)
+                self.prefetched += 1
+                refresh = tracked.refresh
+            self._submit(key, refresh)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            spent = sum(1 for spent_at in self._spent if spent_at > now - 3600)
+            return {
+                'tracked_keys': len(self._keys),
+                'prefetched': self.prefetched,
+                'revalidated': self.revalidated,
+                'over_budget': self.over_budget,
+                'failures': self.failures,
+                'budget_per_hour': self.budget_per_hour,
+                'budget_used_last_hour': spent,
+            }
+
+    def _start(self):
+        with self._lock:
+            if self._scheduler is None:
+                self._scheduler = run_in_background(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(INTERVAL)
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Prefetch scheduling failed")
+
+    def _submit(self, key: str, refresh: Refresh) -> bool:
+        with self._lock:
+            if key in self._in_flight:
+                return False
+            self._in_flight.add(key)
+        run_in_background(self._refresh(key, refresh))
+        return True
+
+    async def _refresh(self, key: str, refresh: Refresh):
+        fresh_until = None
+        try:
+            with tracing.span(f"prefetch {key.split(':', 1)[0]}"):
+                fresh_until = await refresh()
+        except Exception as e:
+            logger.warning("Prefetch of %s failed: %s", key, e)
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+                if fresh_until is None:
+                    # Nothing was stored (an error result or an exception): wait before trying again
+                    self.failures += 1
+                    fresh_until = time.time() + 2 * REFRESH_AHEAD
+                tracked = self._keys.get(key)
+                if tracked is not None:
+                    tracked.fresh_until = fresh_until
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher() -> Prefetcher:
+    """
+    Return the shared prefetcher, creating it on first use.
+
+    TRAVEL_AGENT_PREFETCH_BUDGET sets how many scheduled refreshes may run per
+    hour (default 120, 0 turns prefetching off; stale results are still
+    refreshed after they are served).
+
+    Returns:
+        Prefetcher: The shared prefetcher
+    """
+    global _prefetcher
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                _prefetcher = Prefetcher(int(os.getenv('TRAVEL_AGENT_PREFETCH_BUDGET', '120')))
+    return _prefetcher
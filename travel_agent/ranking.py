@@ -0,0 +1,47 @@
+import heapq
+from itertools import count
+from typing import Any, Callable, Iterable, List
+
+
+class TopK:
+    """
+    The k smallest items seen so far by a key, kept in a bounded heap.
+
+    Adding an item costs O(log k), so results can be ranked as they arrive
+    instead of sorting everything at the end. Items with equal keys keep their
+    arrival order, the same as a stable sort would.
+
+    Args:
+        k (int): Number of items to keep
+        key (Callable): Ranking key; smaller keys rank first
+    """
+
+    def __init__(self, k: int, key: Callable[[Any], Any]):
+        self.k = k
+        self.key = key
+        self._heap = []
+        self._arrivals = count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, item: Any):
+        # A max-heap of the kept items (keys negated), so the worst one is at the root
+        entry = (-self.key(item), -next(self._arrivals), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def extend(self, items: Iterable[Any]):
+        for item in items:
+            self.push(item)
+
+    def ranked(self) -> List[Any]:
+        """
+        Kept items, best first.
+
+        Returns:
+            List[Any]: At most k items ordered by key, then by arrival
+        """
+        return [item for *_, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
@@ -0,0 +1,253 @@
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+PROVIDER_HOSTS = {
+    'test.api.amadeus.com': 'amadeus',
+    'api.amadeus.com': 'amadeus',
+}
+DEFAULT_RATES = {
+    'amadeus': 10.0,
+    'rapidapi': 5.0,
+}
+MAX_WAIT = float(os.getenv('TRAVEL_AGENT_RATE_LIMIT_WAIT', '10'))
+DECREASE_FACTOR = 0.5
+INCREASE_STEPS = 20
+
+
+class RateLimitExceeded(Exception):
+    """
+    A call would have waited longer than its limiter's max_wait for a request slot.
+    """
+
+
+class QuotaExceeded(RateLimitExceeded):
+    """
+    The provider's daily request budget is used up.
+    """
+
+
+class RateLimiter:
+    """
+    Adaptive token bucket for one upstream provider, with a daily request budget.
+
+    Callers reserve a slot before each request. Slots are handed out at `rate`
+    per second with bursts of up to `burst` requests; a caller whose slot is in
+    the future waits for it, so waiting calls form a queue instead of failing.
+    Only a call that would wait more than max_wait seconds is rejected.
+
+    The rate adapts to the provider (additive increase, multiplicative
+    decrease): every 429 halves it and pauses all callers for the Retry-After
+    period, and every other response raises it by max_rate / INCREASE_STEPS
+    until it is back at max_rate.
+
+    Args:
+        name (str): Provider name used in usage reports (e.g., 'amadeus')
+        max_rate (float): Highest number of requests per second
+        burst (int): Requests that may be sent back to back when the bucket is full
+        daily_quota (int): Requests allowed per UTC day (0 for no budget)
+        max_wait (float): Longest a call waits for its slot, in seconds
+    """
+
+    def __init__(self, name: str, max_rate: float, burst: int = 1, daily_quota: int = 0, max_wait: float = MAX_WAIT):
+        self.name = name
+        self.max_rate = max_rate
+        self.min_rate = max_rate / 2 ** 6
+        self.rate = max_rate
+        self.burst = max(1, burst)
+        self.daily_quota = daily_quota
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._day = None
+        self.used_today = 0
+        self.throttled = 0
+        self.queued = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+
+    def reserve(self) -> float:
+        """
+        Reserve the next request slot.
+
+        Returns:
+            float: Seconds to wait before sending the request (0 if it can go now)
+
+        Raises:
+            QuotaExceeded: If today's budget is used up
+            RateLimitExceeded: If the slot is more than max_wait seconds away
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._quota_used_up():
+                self.rejected += 1
+                raise QuotaExceeded(f"Daily {self.name} request budget of {self.daily_quota} is used up")
+
+            slot = self._free_slot(now)
+            delay = slot - now
+            if delay > self.max_wait:
+                self.rejected += 1
+                raise RateLimitExceeded(f"{self.name} rate limit: the next request slot is {delay:.1f}s away")
+
+            self._take(slot)
+            if delay > 0:
+                self.queued += 1
+                self.wait_seconds += delay
+            return delay
+
+    def try_acquire(self) -> bool:
+        """
+        Take a request slot only if one is free right now, for optional requests such as hedges.
+
+        Returns:
+            bool: True if the request may be sent now, False if it would have to wait or the daily budget is used up
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._quota_used_up():
+                return False
+            slot = self._free_slot(now)
+            if slot > now:
+                return False
+            self._take(slot)
+            return True
+
+    def _quota_used_up(self) -> bool:
+        today = datetime.now(timezone.utc).date()
+        if today != self._day:
+            self._day, self.used_today = today, 0
+        return bool(self.daily_quota) and self.used_today >= self.daily_quota
+
+    def _free_slot(self, now: float) -> float:
+        # Earliest start allowed by the bucket: a full bucket lets `burst` requests through at once
+        interval = 1 / self.rate
+        return max(self._next_slot - (self.burst - 1) * interval, self._paused_until, now)
+
+    def _take(self, slot: float):
+        self._next_slot = max(self._next_slot, slot) + 1 / self.rate
+        self.used_today += 1
+
+    def acquire(self):
+        """
+        Block until a request slot is available (see reserve()).
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """
+        Wait on the event loop until a request slot is available (see reserve()).
+        """
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def observe(self, status_code: int, retry_after: Optional[float] = None):
+        """
+        Adapt the rate to a provider response.
+
+        Args:
+            status_code (int): HTTP status of the response
+            retry_after (float): The response's Retry-After in seconds, if it sent one
+        """
+        with self._lock:
+            if status_code == 429:
+                self.throttled += 1
+                self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+                pause = retry_after if retry_after is not None else 1 / self.rate
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            elif self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / INCREASE_STEPS)
+
+    def usage(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'rate': round(self.rate, 2),
+                'max_rate': self.max_rate,
+                'used_today': self.used_today,
+                'daily_quota': self.daily_quota or None,
+                'remaining_today': max(0, self.daily_quota - self.used_today) if self.daily_quota else None,
+                'throttled': self.throttled,
+                'queued': self.queued,
+                'rejected': self.rejected,
+                'wait_seconds': round(self.wait_seconds, 3),
+            }
+
+
+_limiters: Dict[str, Optional[RateLimiter]] = {}
+_limiters_lock = threading.Lock()
+
+
+def provider_for(host: str) -> Optional[str]:
+    """
+    Provider whose rate limits apply to a host.
+
+    Args:
+        host (str): Upstream host name (e.g., 'test.api.amadeus.com')
+
+    Returns:
+        str: 'amadeus' or 'rapidapi', or None for hosts without a limiter
+    """
+    if host in PROVIDER_HOSTS:
+        return PROVIDER_HOSTS[host]
+    if host.endswith('.rapidapi.com'):
+        return 'rapidapi'
+    return None
+
+
+def get_limiter(host: str) -> Optional[RateLimiter]:
+    """
+    Return the shared limiter of a host's provider, creating it on first use.
+
+    <PROVIDER>_RATE_LIMIT sets the highest requests per second (0 turns the
+    limiter off), <PROVIDER>_RATE_BURST the burst size and
+    <PROVIDER>_DAILY_QUOTA the requests allowed per UTC day, with PROVIDER
+    AMADEUS or RAPIDAPI.
+
+    Args:
+        host (str): Upstream host name
+
+    Returns:
+        RateLimiter: The provider's limiter, or None if the host has no limits
+    """
+    provider = provider_for(host)
+    if provider is None:
+        return None
+    if provider not in _limiters:
+        with _limiters_lock:
+            if provider not in _limiters:
+                prefix = provider.upper()
+                rate = float(os.getenv(f'{prefix}_RATE_LIMIT', str(DEFAULT_RATES[provider])))
+                burst = int(os.getenv(f'{prefix}_RATE_BURST', '1'))
+                daily_quota = int(os.getenv(f'{prefix}_DAILY_QUOTA', '0'))
+                _limiters[provider] = RateLimiter(provider, rate, burst, daily_quota) if rate > 0 else None
+    return _limiters[provider]
+
+
+def set_limiter(provider: str, limiter: Optional[RateLimiter]):
+    """
+    Replace a provider's limiter, for example to turn limits off in benchmarks.
+
+    Args:
+        provider (str): 'amadeus' or 'rapidapi'
+        limiter (RateLimiter): The new limiter, or None for no limits
+    """
+    with _limiters_lock:
+        _limiters[provider] = limiter
+
+
+def rate_limit_usage() -> Dict[str, Dict[str, Any]]:
+    """
+    Report the current rate, today's usage against the daily budget and queueing for every provider.
+
+    Returns:
+        dict: Usage keyed by provider name
+    """
+    with _limiters_lock:
+        limiters = [limiter for limiter in _limiters.values() if limiter is not None]
+    return {limiter.name: limiter.usage() for limiter in limiters}
@@ -0,0 +1,323 @@
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+
+def _money(amount: float) -> str:
+    return f"${amount:.2f}"
+
+
+def _timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _minutes(duration: str) -> int:
+    # ISO 8601 durations as Amadeus sends them, e.g. 'PT5H30M' or 'P1DT2H'
+    days, _, clock = duration.lstrip('P').partition('T')
+    minutes = int(days.rstrip('D') or 0) * 24 * 60
+    number = ''
+    for char in clock:
+        if char.isdigit():
+            number += char
+        elif char == 'H':
+            minutes, number = minutes + int(number) * 60, ''
+        elif char == 'M':
+            minutes, number = minutes + int(number), ''
+        else:
+            number = ''
+    return minutes
+
+
+class FlightOffer(NamedTuple):
+    """
+    One flight offer with its times and price kept as numbers until it is displayed.
+    """
+    airline: str
+    departure: datetime
+    arrival: datetime
+    price: float
+    seats_remaining: Optional[int]
+    airline_code: str = ''
+
+    @classmethod
+    def from_amadeus(cls, offer: Dict[str, Any], airline_names: Dict[str, str]) -> 'FlightOffer':
+        """
+        Parse one offer of an Amadeus flight offers search response.
+
+        Args:
+            offer (dict): One entry of the response 'data' list
+            airline_names (Dict[str, str]): Airline names keyed by IATA carrier code
+
+        Returns:
+            FlightOffer: The parsed offer
+        """
+        airline_code = offer['validatingAirlineCodes'][0]
+        segments = offer['itineraries'][0]['segments']
+        return cls(
+            airline=airline_names.get(airline_code, airline_code),
+            departure=_timestamp(segments[0]['departure']['at']),
+            arrival=_timestamp(segments[-1]['arrival']['at']),
+            price=float(offer['price']['total']),
+            seats_remaining=offer.get('numberOfBookableSeats'),
+            airline_code=airline_code
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'airline': self.airline,
+            'departure': self.departure.strftime('%m/%d/%y %I:%M %p'),
+            'arrival': self.arrival.strftime('%m/%d/%y %I:%M %p'),
+            'price': _money(self.price),
+            'seats_remaining': self.seats_remaining
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        # JSON-safe form for the ADK session state (see memo.session_memo)
+        return {**self._asdict(), 'departure': self.departure.isoformat(), 'arrival': self.arrival.isoformat()}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'FlightOffer':
+        return cls(**{**state, 'departure': datetime.fromisoformat(state['departure']), 'arrival': datetime.fromisoformat(state['arrival'])})
+
+
+class FlightSegment(NamedTuple):
+    """
+    One flight of an itinerary.
+    """
+    flight_number: str
+    origin: str
+    destination: str
+    departure: datetime
+    arrival: datetime
+
+    @classmethod
+    def from_amadeus(cls, segment: Dict[str, Any]) -> 'FlightSegment':
+        departure = segment['departure']
+        arrival = segment['arrival']
+        return cls(
+            flight_number=f"{segment['carrierCode']} {segment['number']}",
+            origin=departure['iataCode'],
+            destination=arrival['iataCode'],
+            departure=_timestamp(departure['at']),
+            arrival=_timestamp(arrival['at'])
+        )
+
+
+class Itinerary(NamedTuple):
+    """
+    The flights of one leg of a trip (origin to destination, including connections).
+    """
+    segments: Tuple[FlightSegment, ...]
+    duration_minutes: int
+
+    @classmethod
+    def from_amadeus(cls, itinerary: Dict[str, Any]) -> 'Itinerary':
+        return cls(
+            segments=tuple(FlightSegment.from_amadeus(segment) for segment in itinerary['segments']),
+            duration_minutes=_minutes(itinerary.get('duration', ''))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        first, last = self.segments[0], self.segments[-1]
+        hours, minutes = divmod(self.duration_minutes, 60)
+        return {
+            'from': first.origin,
+            'to': last.destination,
+            'departure': first.departure.strftime('%m/%d/%y %I:%M %p'),
+            'arrival': last.arrival.strftime('%m/%d/%y %I:%M %p'),
+            'duration': f"{hours}h {minutes:02d}m",
+            'stops': len(self.segments) - 1,
+            'flights': [segment.flight_number for segment in self.segments]
+        }
+
+
+class ItineraryOffer(NamedTuple):
+    """
+    One offer for a whole trip (every leg on one ticket), priced for all travelers together.
+    """
+    airline: str
+    itineraries: Tuple[Itinerary, ...]
+    price: float
+    price_per_traveler: float
+    seats_remaining: Optional[int]
+
+    @classmethod
+    def from_amadeus(cls, offer: Dict[str, Any], airline_names: Dict[str, str]) -> 'ItineraryOffer':
+        """
+        Parse one offer of an Amadeus flight offers search response, with every
+        itinerary and segment read in one pass.
+
+        Args:
+            offer (dict): One entry of the response 'data' list
+            airline_names (Dict[str, str]): Airline names keyed by IATA carrier code
+
+        Returns:
+            ItineraryOffer: The parsed offer
+        """
+        airline_code = offer['validatingAirlineCodes'][0]
+        price = float(offer['price']['total'])
+        travelers = offer.get('travelerPricings') or ()
+        return cls(
+            airline=airline_names.get(airline_code, airline_code),
+            itineraries=tuple(Itinerary.from_amadeus(itinerary) for itinerary in offer['itineraries']),
+            price=price,
+            price_per_traveler=price / len(travelers) if travelers else price,
+            seats_remaining=offer.get('numberOfBookableSeats')
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'airline': self.airline,
+            'total_price': _money(self.price),
+            'price_per_traveler': _money(self.price_per_traveler),
+            'seats_remaining': self.seats_remaining,
+            'legs': [itinerary.to_dict() for itinerary in self.itineraries]
+        }
+
+
+class HotelOffer(NamedTuple):
+    """
+    The first offer of one hotel, with its prices kept as numbers until it is displayed.
+    """
+    name: str
+    rating: Any
+    price_per_night: float
+    total_price: float
+    currency: str
+    room_type: str
+    beds: Any
+
+    @classmethod
+    def from_amadeus(cls, offer_group: Dict[str, Any]) -> Optional['HotelOffer']:
+        """
+        Parse one hotel of an Amadeus hotel offers search response.
+
+        Args:
+            offer_group (dict): One entry of the response 'data' list
+
+        Returns:
+            HotelOffer: The hotel's first offer, or None if it has no offers
+        """
+        offers = offer_group.get('offers')
+        if not offers:
+            return None
+
+        hotel_data = offer_group.get('hotel', {})
+        price_data = offers[0].get('price', {})
+        room_type = offers[0].get('room', {}).get('typeEstimated', {})
+        return cls(
+            name=hotel_data.get('name', 'Unknown Hotel'),
+            rating=hotel_data.get('rating', 'N/A'),
+            price_per_night=float(price_data.get('base', 0)),
+            total_price=float(price_data.get('total', 0)),
+            currency=price_data.get('currency', 'USD'),
+            room_type=room_type.get('category', 'Standard'),
+            beds=room_type.get('beds', 'N/A')
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'rating': self.rating,
+            'price_per_night': _money(self.price_per_night),
+            'total_price': _money(self.total_price),
+            'currency': self.currency,
+            'room_type': self.room_type,
+            'beds': self.beds
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        return self._asdict()
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'HotelOffer':
+        return cls(**state)
+
+
+class CarRental(NamedTuple):
+    """
+    One car rental result, with its prices kept as numbers until it is displayed.
+    """
+    company: str
+    car_type: str
+    car_name: str
+    transmission: str
+    seats: Any
+    bags: Any
+    air_conditioning: bool
+    price_per_day: float
+    total_price: float
+    fuel_policy: str
+    mileage: str
+
+    @classmethod
+    def from_rapidapi(cls, car: Dict[str, Any]) -> 'CarRental':
+        """
+        Parse one result of a Booking.com (RapidAPI) car rental search.
+
+        Args:
+            car (dict): One entry of the response 'search_results' list
+
+        Returns:
+            CarRental: The parsed result
+        """
+        vehicle = car.get('vehicle_info', {})
+        pricing = car.get('pricing_info', {})
+        return cls(
+            company=car.get('supplier_info', {}).get('name', 'Unknown'),
+            car_type=vehicle.get('group', 'Standard'),
+            car_name=vehicle.get('v_name', 'N/A'),
+            transmission=vehicle.get('transmission', 'Automatic'),
+            seats=vehicle.get('seats', 'N/A'),
+            bags=vehicle.get('baggage', 'N/A'),
+            air_conditioning=vehicle.get('aircon', False),
+            price_per_day=float(pricing.get('price_per_day', 0)),
+            total_price=float(pricing.get('total_price', pricing.get('price', 0))),
+            fuel_policy=car.get('fuel_policy', 'N/A'),
+            mileage=car.get('mileage', 'Unlimited')
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'company': self.company,
+            'car_type': self.car_type,
+            'car_name': self.car_name,
+            'transmission': self.transmission,
+            'seats': self.seats,
+            'bags': self.bags,
+            'air_conditioning': self.air_conditioning,
+            'price_per_day': _money(self.price_per_day),
+            'total_price': _money(self.total_price),
+            'fuel_policy': self.fuel_policy,
+            'mileage': self.mileage
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        return self._asdict()
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'CarRental':
+        return cls(**state)
+
+
+class DailyWeather(NamedTuple):
+    """
+    The forecast for one day, in °F, inches and mph, kept as numbers until it is displayed.
+    """
+    date: str
+    temperature_high: float
+    temperature_low: float
+    description: str
+    precipitation: float
+    precipitation_probability: Optional[int]
+    max_wind_speed: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'date': self.date,
+            'temperature_high': f"{self.temperature_high:.1f}°F",
+            'temperature_low': f"{self.temperature_low:.1f}°F",
+            'description': self.description,
+            'precipitation': f"{self.precipitation:.2f} inches",
+            'precipitation_probability': f"{self.precipitation_probability}%",
+            'max_wind_speed': f"{self.max_wind_speed:.1f} mph"
+        }
@@ -0,0 +1,129 @@
+import os
+import threading
+from typing import Dict, NamedTuple, Optional
+
+REFERENCE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'reference.tsv')
+
+
+class Airport(NamedTuple):
+    code: str
+    name: str
+    city: str
+    city_code: str
+    country: str
+
+    def label(self) -> str:
+        return f"{self.name} ({self.code})"
+
+
+class ReferenceData:
+    """
+    Airline, airport and weather-code tables, loaded once and looked up by code.
+
+    Every table is a plain dict, so lookups are O(1) and nothing is rebuilt per
+    tool call. Files are tab-separated with the table name in the first column
+    (see data/reference.tsv); files loaded later add to or override earlier ones.
+
+    Args:
+        paths (str): Reference files to load, in order
+    """
+
+    def __init__(self, *paths: str):
+        self.airlines: Dict[str, str] = {}
+        self.airports: Dict[str, Airport] = {}
+        self.weather_codes: Dict[int, str] = {}
+        for path in paths:
+            self.load(path)
+
+    def load(self, path: str):
+        with open(path, encoding='utf-8') as reference_file:
+            for line in reference_file:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                table, code, *fields = line.rstrip('\n').split('\t')
+                if table == 'airline':
+                    self.airlines[code.upper()] = fields[0]
+                elif table == 'airport':
+                    self.airports[code.upper()] = Airport(code.upper(), *fields)
+                elif table == 'weather':
+                    self.weather_codes[int(code)] = fields[0]
+
+    def airline_name(self, code: str) -> str:
+        """
+        Name of an airline, or the code itself if the airline is unknown.
+
+        Args:
+            code (str): IATA carrier code (e.g., 'BA')
+
+        Returns:
+            str: Airline name (e.g., 'British Airways')
+        """
+        return self.airlines.get(code, code)
+
+    def airport(self, code: str) -> Optional[Airport]:
+        return self.airports.get(code.upper())
+
+    def airport_label(self, code: str) -> str:
+        """
+        Display name of an airport, or the code itself if the airport is unknown.
+
+        Args:
+            code (str): IATA airport code (e.g., 'JFK')
+
+        Returns:
+            str: Airport name and code (e.g., 'John F. Kennedy International Airport (JFK)')
+        """
+        airport = self.airports.get(code)
+        return airport.label() if airport else code
+
+    def city_code(self, code: str) -> str:
+        """
+        IATA city code for an airport code (e.g., 'JFK' -> 'NYC'); other codes are returned unchanged.
+
+        Args:
+            code (str): IATA airport or city code
+
+        Returns:
+            str: IATA city code
+        """
+        airport = self.airports.get(code.upper())
+        return airport.city_code if airport else code
+
+    def weather_description(self, code: int) -> str:
+        """
+        Description of a WMO weather interpretation code.
+
+        Args:
+            code (int): Weather code from Open-Meteo (e.g., 61)
+
+        Returns:
+            str: Description (e.g., 'Slight rain'), or 'Unknown'
+        """
+        return self.weather_codes.get(code, "Unknown")
+
+
+_reference = None
+_reference_lock = threading.Lock()
+
+
+def get_reference_data() -> ReferenceData:
+    """
+    Return the shared reference data, loading it on first use.
+
+    The bundled data/reference.tsv is loaded first; TRAVEL_AGENT_REFERENCE_PATH
+    can name an extra file in the same format whose entries are added on top
+    (for example airlines missing from the bundled table).
+
+    Returns:
+        ReferenceData: The shared tables
+    """
+    global _reference
+    if _reference is None:
+        with _reference_lock:
+            if _reference is None:
+                paths = [REFERENCE_PATH]
+                extra_path = os.getenv('TRAVEL_AGENT_REFERENCE_PATH')
+                if extra_path:
+                    paths.append(os.path.expanduser(extra_path))
+                _reference = ReferenceData(*paths)
+    return _reference
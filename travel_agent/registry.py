@@ -0,0 +1,138 @@
+import importlib
+import threading
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from . import transport
+from .cache import DEFAULT_TTL, cached_tool, set_cache_policy
+from .memo import collect_offers
+from .singleflight import single_flight
+from .tracing import traced_tool
+
+
+class Provider(NamedTuple):
+    """
+    An upstream service the tools call, with the hosts its requests go to.
+
+    'car-rentals' stands for the backends registered in car_providers.py,
+    which change at run time; its tools send their requests through those
+    backends (the built-in one to rapidapi), so it has no hosts of its own.
+    """
+    name: str
+    hosts: Tuple[str, ...]
+
+
+PROVIDERS = {
+    'amadeus': Provider('amadeus', ('test.api.amadeus.com', 'api.amadeus.com')),
+    'open-meteo': Provider('open-meteo', ('geocoding-api.open-meteo.com', 'api.open-meteo.com')),
+    'rapidapi': Provider('rapidapi', ('booking-com15.p.rapidapi.com',)),
+    'car-rentals': Provider('car-rentals', ()),
+}
+
+
+class ToolSpec(NamedTuple):
+    """
+    A registered tool and the policies it was declared with.
+    """
+    name: str
+    function: Callable
+    provider: str
+    cached: bool
+    ttl: float
+    stale_ttl: float
+    coalesced: bool
+    memoized: bool
+    streaming: bool
+
+
+_tools: Dict[str, ToolSpec] = {}
+_tools_lock = threading.Lock()
+
+
+def _register(spec: ToolSpec):
+    if spec.provider not in PROVIDERS:
+        raise ValueError(f"Tool {spec.name} uses unknown provider {spec.provider!r}. Use any of: {', '.join(PROVIDERS)}")
+    with _tools_lock:
+        _tools[spec.name] = spec
+
+
+def tool(provider: str, cache: bool = True, ttl: float = DEFAULT_TTL, stale_ttl: float = 0, coalesce: bool = True, memo: Optional[Callable] = None) -> Callable:
+    """
+    Declare an async tool function with its provider and its cache and concurrency policy.
+
+    The decorators are stacked in one fixed order, outermost first: tracing,
+    the session memo, the shared result cache, request coalescing and, for
+    memoized tools, the collection of raw offers. A coalesced call therefore
+    runs once per key however many cache misses ask for it, a memo hit skips
+    the cache and the provider entirely, and the raw offers are cached and
+    shared with the result, so cache hits fill the session memo as well.
+
+    Args:
+        provider (str): Key of PROVIDERS the tool sends its requests to
+        cache (bool): Keep successful results in the shared tool cache (default: True)
+        ttl (float): Seconds a cached result is fresh (CACHE_TTL_<TOOL NAME> overrides it)
+        stale_ttl (float): Seconds past its TTL a cached result is still served while it is refreshed (CACHE_STALE_<TOOL NAME> overrides it)
+        coalesce (bool): Share one upstream call between concurrent calls with the same arguments (default: True)
+        memo (Callable): A memo.session_memo(...) decorator, for tools whose follow-ups can be answered from the session
+
+    Returns:
+        Callable: Decorator that wraps and registers the tool
+    """
+    def register(func: Callable) -> Callable:
+        wrapped = func
+        if memo is not None:
+            wrapped = collect_offers(wrapped)
+        if coalesce:
+            wrapped = single_flight(wrapped)
+        if cache:
+            set_cache_policy(func.__name__, ttl, stale_ttl)
+            wrapped = cached_tool(wrapped)
+        if memo is not None:
+            wrapped = memo(wrapped)
+        wrapped = traced_tool(wrapped)
+        _register(ToolSpec(func.__name__, wrapped, provider, cache, ttl if cache else 0, stale_ttl if cache else 0, coalesce, memo is not None, False))
+        return wrapped
+
+    return register
+
+
+def streaming_tool(provider: str) -> Callable:
+    """
+    Declare an async generator tool that streams partial results (ADK live sessions only).
+
+    Streaming tools are neither cached nor coalesced: every caller needs its own stream.
+
+    Args:
+        provider (str): Key of PROVIDERS the tool sends its requests to
+
+    Returns:
+        Callable: Decorator that registers the tool and returns it unchanged
+    """
+    def register(func: Callable) -> Callable:
+        _register(ToolSpec(func.__name__, func, provider, False, 0, 0, False, False, True))
+        return func
+
+    return register
+
+
+def tool_specs() -> Dict[str, ToolSpec]:
+    """
+    Every registered tool, importing the tool module on first use.
+
+    Returns:
+        Dict[str, ToolSpec]: Tool specs keyed by tool name, in declaration order
+    """
+    importlib.import_module('.tools', __package__)
+    with _tools_lock:
+        return dict(_tools)
+
+
+def use_provider_backend(provider: str, base_url: Optional[str]):
+    """
+    Send a provider's requests to another backend, such as a local fake, or back to the real service.
+
+    Args:
+        provider (str): Key of PROVIDERS
+        base_url (str): Scheme and host of the backend (e.g., 'http://127.0.0.1:8081'), or None for the real service
+    """
+    for host in PROVIDERS[provider].hosts:
+        transport.set_upstream_override(host, base_url)
@@ -0,0 +1,115 @@
+import asyncio
+import concurrent.futures
+import copy
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Dict
+
+from . import tracing
+from .cache import make_key
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one upstream call.
+
+    The first caller for a key (the leader) runs the call; callers that arrive
+    while it is in flight wait for the leader's result instead of starting
+    their own. The shared slot is a concurrent.futures.Future, so waiters can
+    be coroutines on any event loop. If the leader is cancelled, one of the
+    waiters takes over as the new leader.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, concurrent.futures.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _join(self, key: str) -> tuple:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                tracing.annotate(coalesced=True)
+                return future, False
+            future = self._calls[key] = concurrent.futures.Future()
+            self.leaders += 1
+            return future, True
+
+    def _finish(self, key: str, future: concurrent.futures.Future, result: Any = None, error: BaseException = None):
+        with self._lock:
+            self._calls.pop(key, None)
+        if isinstance(error, (asyncio.CancelledError, concurrent.futures.CancelledError)):
+            future.cancel()
+        elif error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def call(self, key: str, func: Callable, *args, **kwargs) -> Any:
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return copy.deepcopy(await asyncio.shield(asyncio.wrap_future(future)))
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    continue
+                raise
+
+        try:
+            result = await func(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self.leaders + self.coalesced
+            return {
+                'upstream_calls': self.leaders,
+                'coalesced_calls': self.coalesced,
+                'in_flight': len(self._calls),
+                'coalesced_rate': round(self.coalesced / calls, 4) if calls else 0.0,
+            }
+
+
+_flights = SingleFlight()
+
+
+def single_flight(func: Callable) -> Callable:
+    """
+    Share one upstream call between concurrent calls of a tool with the same normalized arguments.
+
+    Arguments are normalized the same way as the tool cache keys.
+
+    Args:
+        func (Callable): Async tool function
+
+    Returns:
+        Callable: Wrapped function with the same name, signature and docstring
+    """
+    signature = inspect.signature(func)
+    tool_name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = make_key(tool_name, signature, args, kwargs)
+        return await _flights.call(key, func, *args, **kwargs)
+
+    return wrapper
+
+
+def singleflight_stats() -> Dict[str, Any]:
+    """
+    Report how many tool calls were served by another call's upstream request.
+
+    Returns:
+        dict: Upstream and coalesced call counts
+    """
+    return _flights.stats()
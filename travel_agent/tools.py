@@ -1,205 +1,716 @@
-from typing import List, Dict, Optional
-import requests
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, AsyncGenerator, AsyncIterator, List, Dict, Optional
 import os
-from datetime import datetime
-from amadeus import Client, ResponseError
-from ddgs import DDGS
-from bs4 import BeautifulSoup
-import requests
-import random
-import time
-from dotenv import load_dotenv
+from amadeus import ResponseError
+import asyncio
+import heapq
+from operator import attrgetter
 
-load_dotenv()
+from .aio import sync_tool
+from .amadeus_client import get_amadeus
+from .car_providers import CarProvider, CarProviderError, CarRentalQuery, car_providers
+from . import tracing, transport
+from .geocode import Place, geocode
+from .hotel_catalog import get_hotel_catalog, hotel_ids_for_city
+from .memo import current_collector, session_memo
+from .ranking import TopK
+from .records import CarRental, DailyWeather, FlightOffer, HotelOffer, ItineraryOffer
+from .cache import cached_tool, set_cache_policy
+from .reference import get_reference_data
+from .registry import streaming_tool, tool
+from .singleflight import single_flight
 
-amadeus = Client(
-    client_id=os.getenv('AMADEUS_CLIENT_ID'),
-    client_secret=os.getenv('AMADEUS_CLIENT_SECRET')
-)
+if TYPE_CHECKING:
+    from google.adk.tools import ToolContext
 
 
-def check_flights(destination: str, departure_date: str, origin: str) -> dict:
+HOTEL_BATCH_SIZE = 10
+HOTEL_MAX_IDS = 100
+HOTEL_EARLY_STOP = 15
+HOTEL_RESULTS = 10
+HOTEL_BATCH_CONCURRENCY = int(os.getenv('HOTEL_BATCH_CONCURRENCY', '5'))
+MAX_FORECAST_DAYS = 16
+CAR_RESULTS = 10
+FLIGHT_DATE_CONCURRENCY = int(os.getenv('FLIGHT_DATE_CONCURRENCY', '5'))
+MAX_FLEXIBLE_DAYS = 14
+FLEXIBLE_BEST_OFFERS = 5
+MAX_ITINERARY_LEGS = 6
+MAX_TRAVELERS = 9
+ITINERARY_RESULTS = 10
+
+
+FLIGHT_SORT_KEYS = {
+    '': None,
+    'price': attrgetter('price'),
+    'departure': attrgetter('departure'),
+    'duration': lambda flight: flight.arrival - flight.departure,
+}
+
+
+def _airline_codes(airline: str) -> frozenset:
+    """
+    IATA codes of the airline a user asked for, by code or by name.
+
+    Args:
+        airline (str): IATA code (e.g., 'DL') or name (e.g., 'Delta Air Lines' or 'Delta')
+
+    Returns:
+        frozenset: The code itself, or the codes of the airlines with that name;
+        when no name matches exactly, the airlines whose name starts with those words
+    """
+    wanted = ' '.join(airline.split()).casefold()
+    airlines = get_reference_data().airlines
+    if wanted.upper() in airlines:
+        return frozenset({wanted.upper()})
+    codes = {code for code, name in airlines.items() if name.casefold() == wanted}
+    if not codes:
+        codes = {code for code, name in airlines.items() if name.casefold().startswith(wanted + ' ')}
+    if not codes and len(wanted) in (2, 3) and wanted.isalnum():
+        # A carrier code missing from the reference table
+        codes = {wanted.upper()}
+    return frozenset(codes)
+
+
+def _flight_result(flights: List[FlightOffer], airline: str, max_price: float, sort_by: str) -> dict:
     """
-    Check available flights for a given destination and date.
+    Apply check_flights' airline and price filters and sort order to the offers of a search.
+
+    Args:
+        flights (List[FlightOffer]): Every offer of the search, in provider order
+        airline (str): Airline name or IATA code to keep ('' for all)
+        max_price (float): Highest price to keep (0 for no limit)
+        sort_by (str): A key of FLIGHT_SORT_KEYS ('' keeps the provider order)
+
+    Returns:
+        dict: The check_flights result
+    """
+    if airline:
+        codes = _airline_codes(airline)
+        flights = [flight for flight in flights if flight.airline_code in codes]
+    if max_price:
+        flights = [flight for flight in flights if flight.price <= max_price]
+    if FLIGHT_SORT_KEYS[sort_by]:
+        flights = sorted(flights, key=FLIGHT_SORT_KEYS[sort_by])
+
+    if not flights:
+        return {"status": "error", "error": "No flights match the requested airline or price"}
+    with tracing.span('format_result'):
+        return {"status": "success", "flights": [flight.to_dict() for flight in flights]}
+
+
+def _answer_flights(flights: List[FlightOffer], complete: bool, arguments: dict) -> Optional[dict]:
+    if arguments['sort_by'] not in FLIGHT_SORT_KEYS:
+        return None
+    return _flight_result(flights, arguments['airline'], arguments['max_price'], arguments['sort_by'])
+
+
+@tool('amadeus', cache=False, memo=session_memo(FlightOffer, ('airline', 'max_price', 'sort_by'), _answer_flights))
+async def check_flights(
+    destination: str,
+    departure_date: str,
+    origin: str,
+    adults: int = 1,
+    airline: str = '',
+    max_price: float = 0,
+    sort_by: str = '',
+    tool_context: Optional['ToolContext'] = None
+) -> dict:
+    """
+    Check available one-way flights for a given destination and date.
 
     Args:
         destination (str): IATA code of destination airport (e.g., 'JFK' for New York JFK)
         departure_date (str): Date in format mm/dd/yy (e.g., '12/13/25' for December 13, 2025)
         origin (str): IATA code of origin airport (e.g., 'LAX' for Los Angeles)
+        adults (int): Number of adult travelers; prices are for all of them together (default: 1)
+        airline (str): Only show this airline, by name or IATA code (e.g., 'Delta' or 'DL'; default: all airlines)
+        max_price (float): Only show flights up to this total price in USD (default: 0, no limit)
+        sort_by (str): 'price', 'departure' or 'duration' (default: '', the provider's order)
 
     Returns:
         dict: Dictionary with 'status' and 'flights' or 'error' containing flight details
     """
-    airline_names = {
-        'BA': 'British Airways',
-        'AF': 'Air France',
-        'LH': 'Lufthansa',
-        'AA': 'American Airlines',
-        'UA': 'United Airlines',
-        'DL': 'Delta Air Lines',
-        'EK': 'Emirates',
-        'IB': 'Iberia',
-        'KL': 'KLM Royal Dutch Airlines',
-        'QF': 'Qantas',
-        'F9': 'Frontier Airlines',
-        'W2': 'FlexFlight',
-        'WN': 'Southwest Airlines',
-        'B6': 'JetBlue Airways',
-        'AS': 'Alaska Airlines',
-        'NK': 'Spirit Airlines',
-        'WS': 'WestJet',
-        'AC': 'Air Canada',
-        'VS': 'Virgin Atlantic',
-        'TK': 'Turkish Airlines',
-        'LX': 'Swiss International Air Lines',
-        'OS': 'Austrian Airlines',
-        'AY': 'Finnair',
-        'SK': 'SAS Scandinavian Airlines',
-        'EI': 'Aer Lingus',
-        'TP': 'TAP Air Portugal',
-        'LO': 'LOT Polish Airlines',
-        'AZ': 'ITA Airways',
-        'SN': 'Brussels Airlines'
-    }
+    if sort_by not in FLIGHT_SORT_KEYS:
+        return {"status": "error", "error": "sort_by must be 'price', 'departure' or 'duration'"}
 
     try:
-        formatted_date = datetime.strptime(departure_date, '%m/%d/%y').strftime('%Y-%m-%d')
-        
-        response = amadeus.shopping.flight_offers_search.get(
+        with tracing.span('parse_dates'):
+            formatted_date = datetime.strptime(departure_date, '%m/%d/%y').strftime('%Y-%m-%d')
+
+        flights = await _search_flights(destination, formatted_date, origin, adults)
+        if flights:
+            collector = current_collector()
+            if collector is not None:
+                collector.add(flights)
+            return _flight_result(flights, airline, max_price, sort_by)
+
+        return {"status": "error", "error": "No flights found"}
+
+    except ResponseError as e:
+        return {"status": "error", "error": f"Error checking flights: {str(e)}"}
+    except Exception as e:
+        return {"status": "error", "error": f"Unexpected error: {str(e)}"}
+
+
+async def _search_flights(destination: str, departure_date: str, origin: str, adults: int = 1) -> List[FlightOffer]:
+    """
+    Search one-way flight offers on one date, through the per-date flight cache.
+
+    check_flights and check_flights_flexible both search through here, so a
+    date searched by either one (or by two overlapping flexible searches) is
+    served from the same cache entry, under check_flights' cache policy, and
+    concurrent searches for it share one request.
+
+    Args:
+        destination (str): IATA code of destination airport
+        departure_date (str): Date in format YYYY-MM-DD
+        origin (str): IATA code of origin airport
+        adults (int): Number of adult travelers
+
+    Returns:
+        List[FlightOffer]: Every offer, in provider order (empty if there are none)
+
+    Raises:
+        ResponseError: If the Amadeus API call fails
+    """
+    result = await _cached_flight_offers(destination, departure_date, origin, adults)
+    return [FlightOffer.from_state(offer) for offer in result.get('offers', [])]
+
+
+async def _fetch_flight_offers(destination: str, departure_date: str, origin: str, adults: int = 1) -> dict:
+    """
+    Search Amadeus for one-way flight offers on one date.
+
+    Returns:
+        dict: {'status': 'success', 'offers': [...]} with each offer in FlightOffer.to_state() form, or an error when there are none
+
+    Raises:
+        ResponseError: If the Amadeus API call fails
+    """
+    with tracing.span('amadeus flight_offers_search'):
+        response = await asyncio.to_thread(
+            get_amadeus().shopping.flight_offers_search.get,
             originLocationCode=origin,
             destinationLocationCode=destination,
-            departureDate=formatted_date,
-            adults=1,
-            max=15, 
+            departureDate=departure_date,
+            adults=adults,
+            max=25,
             currencyCode='USD'
         )
-        
-        if response.data:
-            flights = []
-            for offer in response.data:
-                airline_code = offer['validatingAirlineCodes'][0]
-                airline_name = airline_names.get(airline_code, airline_code)
-
-                departure_time = datetime.fromisoformat(offer['itineraries'][0]['segments'][0]['departure']['at'].replace('Z', '+00:00'))
-                arrival_time = datetime.fromisoformat(offer['itineraries'][0]['segments'][-1]['arrival']['at'].replace('Z', '+00:00'))
-
-                flight = {
-                    'airline': airline_name,
-                    'departure': departure_time.strftime('%m/%d/%y %I:%M %p'),
-                    'arrival': arrival_time.strftime('%m/%d/%y %I:%M %p'),
-                    'price': f"${float(offer['price']['total']):.2f}",
-                    'seats_remaining': offer['numberOfBookableSeats']
-                }
-                flights.append(flight)
-            return {"status": "success", "flights": flights}
 
+    if not response.data:
         return {"status": "error", "error": "No flights found"}
+    with tracing.span('parse_response', offers=len(response.data)):
+        offers = [FlightOffer.from_amadeus(offer, get_reference_data().airlines) for offer in response.data]
+    return {"status": "success", "offers": [offer.to_state() for offer in offers]}
+
+
+set_cache_policy('check_flights', 5 * 60, 5 * 60)
+_cached_flight_offers = cached_tool(single_flight(_fetch_flight_offers), name='check_flights')
+
+
+@tool('amadeus', cache=False)
+async def check_flights_flexible(destination: str, start_date: str, end_date: str, origin: str, adults: int = 1) -> dict:
+    """
+    Find the cheapest day to fly within a window of departure dates in a single lookup.
+    Use this instead of calling check_flights once per date when the travel date is flexible.
+
+    Args:
+        destination (str): IATA code of destination airport (e.g., 'JFK' for New York JFK)
+        start_date (str): Earliest departure date in format mm/dd/yy (e.g., '12/13/25')
+        end_date (str): Latest departure date in format mm/dd/yy (e.g., '12/20/25')
+        origin (str): IATA code of origin airport (e.g., 'LAX' for Los Angeles)
+        adults (int): Number of adult travelers; prices are for all of them together (default: 1)
 
+    Returns:
+        dict: Dictionary with 'status', 'price_by_date' (cheapest fare per date, null when there are no flights), 'cheapest_date' and 'best_offers', or 'error';
+        dates whose search failed are listed in 'failed_dates' instead, and the result is marked 'partial'
+    """
+    try:
+        with tracing.span('parse_dates'):
+            first_day = datetime.strptime(start_date, '%m/%d/%y')
+            last_day = datetime.strptime(end_date, '%m/%d/%y')
+    except ValueError as e:
+        return {"status": "error", "error": f"Invalid date format. Please use mm/dd/yy format: {str(e)}"}
+
+    if last_day < first_day:
+        return {"status": "error", "error": "The end date must be on or after the start date"}
+    if (last_day - first_day).days >= MAX_FLEXIBLE_DAYS:
+        return {"status": "error", "error": f"Flexible searches are limited to {MAX_FLEXIBLE_DAYS} departure dates. Please use a shorter date range."}
+
+    days = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+    dates = [day.strftime('%m/%d/%y') for day in days]
+    try:
+        results = await _search_flight_dates(destination, [day.strftime('%Y-%m-%d') for day in days], origin, adults)
+    except Exception as e:
+        return {"status": "error", "error": f"Unexpected error: {str(e)}"}
+
+    failed_dates = [departure_date for departure_date, flights in zip(dates, results) if flights is None]
+    offers = [(flight, departure_date) for departure_date, flights in zip(dates, results) for flight in flights or []]
+    if not offers:
+        if failed_dates:
+            return {"status": "error", "error": f"Error checking flights: the search failed for {', '.join(failed_dates)}. Please try again."}
+        return {"status": "error", "error": "No flights found for any date in the range"}
+
+    best = heapq.nsmallest(FLEXIBLE_BEST_OFFERS, offers, key=lambda offer: offer[0].price)
+    with tracing.span('format_result', dates=len(dates)):
+        price_by_date = {}
+        for departure_date, flights in zip(dates, results):
+            if flights is None:
+                continue
+            if not flights:
+                price_by_date[departure_date] = None
+                continue
+            cheapest = min(flights, key=attrgetter('price')).to_dict()
+            price_by_date[departure_date] = {'price': cheapest['price'], 'airline': cheapest['airline'], 'offers': len(flights)}
+
+        result = {
+            "status": "success",
+            "price_by_date": price_by_date,
+            "cheapest_date": best[0][1],
+            "best_offers": [{'date': departure_date, **flight.to_dict()} for flight, departure_date in best]
+        }
+        if failed_dates:
+            # Marked partial so a passing failure is never cached as "no flights on these dates"
+            result.update(partial=True, failed_dates=failed_dates)
+        return result
+
+
+async def _search_flight_dates(destination: str, dates: List[str], origin: str, adults: int = 1) -> List[Optional[List[FlightOffer]]]:
+    """
+    Search several departure dates at the same time.
+
+    At most FLIGHT_DATE_CONCURRENCY searches are in flight at a time.
+
+    Args:
+        destination (str): IATA code of destination airport
+        dates (List[str]): Departure dates in format YYYY-MM-DD
+        origin (str): IATA code of origin airport
+        adults (int): Number of adult travelers
+
+    Returns:
+        List[Optional[List[FlightOffer]]]: The offers of each date, in the same order (None for a date whose search failed)
+    """
+    semaphore = asyncio.Semaphore(max(1, FLIGHT_DATE_CONCURRENCY))
+
+    async def search(departure_date):
+        async with semaphore:
+            try:
+                return await _search_flights(destination, departure_date, origin, adults)
+            except ResponseError:
+                return None
+
+    return await asyncio.gather(*(search(departure_date) for departure_date in dates))
+
+
+@tool('amadeus', ttl=5 * 60)
+async def check_itinerary(airports: List[str], dates: List[str], adults: int = 1) -> dict:
+    """
+    Search a round-trip or multi-city trip, with every leg priced together on one ticket.
+    The trip flies airports[0] to airports[1] on dates[0], airports[1] to airports[2] on dates[1], and so on.
+    For a round trip, end with the origin again (e.g., ['LAX', 'JFK', 'LAX']).
+
+    Args:
+        airports (List[str]): IATA airport codes in travel order (e.g., ['LAX', 'JFK', 'LHR'])
+        dates (List[str]): Departure date of each leg in format mm/dd/yy, one fewer than airports (e.g., ['12/13/25', '12/18/25'])
+        adults (int): Number of adult travelers (default: 1)
+
+    Returns:
+        dict: Dictionary with 'status' and 'itineraries' (total and per-traveler price plus each leg's flights, cheapest first) or 'error'
+    """
+    if len(airports) < 2 or len(dates) != len(airports) - 1:
+        return {"status": "error", "error": "Give one departure date per leg: the list of dates must be one shorter than the list of airports"}
+    if len(dates) > MAX_ITINERARY_LEGS:
+        return {"status": "error", "error": f"Itineraries are limited to {MAX_ITINERARY_LEGS} legs"}
+    if not 1 <= adults <= MAX_TRAVELERS:
+        return {"status": "error", "error": f"Itineraries can be searched for 1 to {MAX_TRAVELERS} adults"}
+
+    try:
+        with tracing.span('parse_dates'):
+            departures = [datetime.strptime(departure_date, '%m/%d/%y') for departure_date in dates]
+    except ValueError as e:
+        return {"status": "error", "error": f"Invalid date format. Please use mm/dd/yy format: {str(e)}"}
+    if departures != sorted(departures):
+        return {"status": "error", "error": "Each leg must depart on or after the date of the previous leg"}
+
+    search = {
+        'currencyCode': 'USD',
+        'originDestinations': [
+            {
+                'id': str(leg),
+                'originLocationCode': origin,
+                'destinationLocationCode': destination,
+                'departureDateTimeRange': {'date': departure.strftime('%Y-%m-%d')}
+            }
+            for leg, (origin, destination, departure) in enumerate(zip(airports, airports[1:], departures), start=1)
+        ],
+        'travelers': [{'id': str(traveler), 'travelerType': 'ADULT'} for traveler in range(1, adults + 1)],
+        'sources': ['GDS'],
+        'searchCriteria': {'maxFlightOffers': 25}
+    }
+
+    try:
+        with tracing.span('amadeus flight_offers_search', legs=len(departures)):
+            response = await asyncio.to_thread(get_amadeus().shopping.flight_offers_search.post, search)
     except ResponseError as e:
-        return {"status": "error", "error": f"Error checking flights: {str(e)}"}
+        return {"status": "error", "error": f"Error checking itineraries: {str(e)}"}
     except Exception as e:
         return {"status": "error", "error": f"Unexpected error: {str(e)}"}
 
+    if not response.data:
+        return {"status": "error", "error": "No itineraries found"}
+
+    with tracing.span('parse_response', offers=len(response.data)):
+        offers = [ItineraryOffer.from_amadeus(offer, get_reference_data().airlines) for offer in response.data]
+    with tracing.span('format_result'):
+        cheapest = heapq.nsmallest(ITINERARY_RESULTS, offers, key=attrgetter('price'))
+        return {"status": "success", "itineraries": [offer.to_dict() for offer in cheapest]}
+
+
+@tool('amadeus', cache=False, coalesce=False)
+async def check_round_trip(origin: str, destination: str, departure_date: str, return_date: str, adults: int = 1) -> dict:
+    """
+    Search round-trip flights, with the outbound and return flights priced together on one ticket.
+
+    Args:
+        origin (str): IATA code of origin airport (e.g., 'LAX' for Los Angeles)
+        destination (str): IATA code of destination airport (e.g., 'JFK' for New York JFK)
+        departure_date (str): Outbound date in format mm/dd/yy (e.g., '12/13/25')
+        return_date (str): Return date in format mm/dd/yy (e.g., '12/18/25')
+        adults (int): Number of adult travelers (default: 1)
+
+    Returns:
+        dict: Dictionary with 'status' and 'itineraries' (total and per-traveler price plus the outbound and return flights, cheapest first) or 'error'
+    """
+    return await check_itinerary([origin, destination, origin], [departure_date, return_date], adults)
+
 
-def check_hotels(city_code: str, check_in_date: str, check_out_date: str, adults: int = 1, min_price_per_night: float = 0, max_price_per_night: float = 10000) -> dict:
+def _fetch_hotel_batch(batch_ids: List[str], check_in: str, check_out: str, adults: int) -> Optional[List[HotelOffer]]:
+    """
+    Fetch offers for one batch of hotel IDs.
+
+    Args:
+        batch_ids (List[str]): Amadeus hotel IDs to query together
+        check_in (str): Check-in date in format YYYY-MM-DD
+        check_out (str): Check-out date in format YYYY-MM-DD
+        adults (int): Number of adults
+
+    Returns:
+        List[HotelOffer]: Offers of the batch at any price, or None if the batch failed
+    """
+    try:
+        offers_response = get_amadeus().shopping.hotel_offers_search.get(
+            hotelIds=','.join(batch_ids),
+            checkInDate=check_in,
+            checkOutDate=check_out,
+            adults=adults,
+            currency='USD'
+        )
+    except ResponseError:
+        tracing.annotate(failed=True)
+        return None
+
+    hotel_ids = (group.get('hotel', {}).get('hotelId') for group in offers_response.data or [] if group.get('offers'))
+    get_hotel_catalog().record_offers(hotel_id for hotel_id in hotel_ids if hotel_id)
+    with tracing.span('parse_response', offers=len(offers_response.data or [])):
+        return _parse_hotel_offers(offers_response.data or [])
+
+
+def _parse_hotel_offers(offer_groups: List[Dict]) -> List[HotelOffer]:
+    """
+    Parse Amadeus hotel offers.
+
+    Args:
+        offer_groups (List[Dict]): The 'data' list of a hotel offers search response
+
+    Returns:
+        List[HotelOffer]: Every hotel with an offer, in response order
+    """
+    hotels = []
+    for offer_group in offer_groups:
+        hotel = HotelOffer.from_amadeus(offer_group)
+        if hotel is not None:
+            hotels.append(hotel)
+    return hotels
+
+
+def _hotel_rating(hotel: HotelOffer) -> float:
+    try:
+        return float(hotel.rating)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+HOTEL_SORT_KEYS = {
+    'price': attrgetter('total_price'),
+    'rating': lambda hotel: -_hotel_rating(hotel),
+}
+
+
+async def _iter_hotel_offers(hotel_ids: List[str], check_in: str, check_out: str, adults: int, min_price_per_night: float, max_price_per_night: float, failed: List[int]) -> AsyncIterator[List[HotelOffer]]:
+    """
+    Run the hotel offer batches and yield each batch's offers as soon as it returns.
+
+    Up to HOTEL_BATCH_CONCURRENCY batches are in flight at a time, each run in a
+    worker thread so the blocking Amadeus SDK stays off the event loop. Batches
+    are yielded in the order they finish; once HOTEL_EARLY_STOP hotels have been
+    yielded the batches still pending are cancelled. Every offer received, in
+    range or not, goes to the session memo's collector. A batch that fails is
+    skipped and its number added to `failed`; the collector is then not
+    complete.
+
+    Args:
+        hotel_ids (List[str]): Amadeus hotel IDs to search
+        check_in (str): Check-in date in format YYYY-MM-DD
+        check_out (str): Check-out date in format YYYY-MM-DD
+        adults (int): Number of adults
+        min_price_per_night (float): Minimum price per night in USD
+        max_price_per_night (float): Maximum price per night in USD
+        failed (List[int]): Receives the numbers of the batches that failed
+
+    Yields:
+        List[HotelOffer]: The in-range offers of one batch (at most HOTEL_EARLY_STOP hotels in total)
+    """
+    batches = [hotel_ids[i:i + HOTEL_BATCH_SIZE] for i in range(0, min(len(hotel_ids), HOTEL_MAX_IDS), HOTEL_BATCH_SIZE)]
+    args = (check_in, check_out, adults)
+    semaphore = asyncio.Semaphore(max(1, HOTEL_BATCH_CONCURRENCY))
+    remaining = HOTEL_EARLY_STOP
+    collector = current_collector()
+    if collector is not None:
+        collector.complete = False
+
+    async def fetch(number, batch_ids):
+        async with semaphore:
+            with tracing.span('amadeus hotel_offers_search', batch=number, hotel_ids=len(batch_ids)) as current:
+                hotels = await asyncio.to_thread(_fetch_hotel_batch, batch_ids, *args)
+                if current is not None and hotels is not None:
+                    current.set(hotels=len(hotels))
+                return number, hotels
+
+    tasks = [asyncio.create_task(fetch(number, batch_ids)) for number, batch_ids in enumerate(batches)]
+    searched = 0
+    try:
+        for finished in asyncio.as_completed(tasks):
+            number, offers = await finished
+            searched += 1
+            if offers is None:
+                failed.append(number)
+                continue
+            if collector is not None:
+                collector.add(offers)
+            hotels = [hotel for hotel in offers if min_price_per_night <= hotel.price_per_night <= max_price_per_night][:remaining]
+            if hotels:
+                remaining -= len(hotels)
+                yield hotels
+            if remaining <= 0:
+                break
+        if collector is not None:
+            collector.complete = searched == len(tasks) and not failed
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _hotel_result(hotels: List[HotelOffer], min_price_per_night: float, max_price_per_night: float) -> dict:
+    """
+    Format the ranked hotels of a search as the check_hotels result.
+
+    Args:
+        hotels (List[HotelOffer]): The best hotels in range, best first
+        min_price_per_night (float): Minimum price per night in USD
+        max_price_per_night (float): Maximum price per night in USD
+
+    Returns:
+        dict: The check_hotels result
+    """
+    if hotels:
+        with tracing.span('format_result', hotels=len(hotels)):
+            return {"status": "success", "hotels": [hotel.to_dict() for hotel in hotels]}
+    if min_price_per_night > 0 or max_price_per_night < 10000:
+        return {"status": "error", "error": f"No hotels found in the ${min_price_per_night:.0f}-${max_price_per_night:.0f} per night price range for the specified dates. Try widening your price range or different dates."}
+    return {"status": "error", "error": "No available hotel offers found for the specified dates"}
+
+
+def _answer_hotels(hotels: List[HotelOffer], complete: bool, arguments: dict) -> Optional[dict]:
+    min_price_per_night, max_price_per_night = arguments['min_price_per_night'], arguments['max_price_per_night']
+    in_range = [hotel for hotel in hotels if min_price_per_night <= hotel.price_per_night <= max_price_per_night]
+    # A search that stopped early may have skipped hotels in the new range, unless it already holds as many as a search would return
+    if (not complete and len(in_range) < HOTEL_EARLY_STOP) or arguments['sort_by'] not in HOTEL_SORT_KEYS:
+        return None
+    best = TopK(HOTEL_RESULTS, key=HOTEL_SORT_KEYS[arguments['sort_by']])
+    best.extend(in_range)
+    return _hotel_result(best.ranked(), min_price_per_night, max_price_per_night)
+
+
+async def _search_hotels(city_code: str, check_in_date: str, check_out_date: str, adults: int, min_price_per_night: float, max_price_per_night: float, sort_by: str) -> AsyncIterator[dict]:
+    """
+    Search hotels and yield the best ones found so far after every batch of offers.
+
+    The best HOTEL_RESULTS hotels by sort_by are kept in a running heap as
+    offers arrive, so each partial result is ready without sorting everything again.
+
+    Yields:
+        dict: {'status': 'partial', 'hotels': [...]} after each batch that added hotels, then the final result
+    """
+    if sort_by not in HOTEL_SORT_KEYS:
+        yield {"status": "error", "error": "sort_by must be 'price' or 'rating'"}
+        return
+
+    try:
+        with tracing.span('parse_dates'):
+            formatted_check_in = datetime.strptime(check_in_date, '%m/%d/%y').strftime('%Y-%m-%d')
+            formatted_check_out = datetime.strptime(check_out_date, '%m/%d/%y').strftime('%Y-%m-%d')
+
+        hotel_ids = await hotel_ids_for_city(get_reference_data().city_code(city_code))
+
+        if not hotel_ids:
+            yield {"status": "error", "error": "No hotels found in this city"}
+            return
+
+        best = TopK(HOTEL_RESULTS, key=HOTEL_SORT_KEYS[sort_by])
+        failed = []
+        async for hotels in _iter_hotel_offers(
+            hotel_ids, formatted_check_in, formatted_check_out, adults,
+            min_price_per_night, max_price_per_night, failed
+        ):
+            best.extend(hotels)
+            yield {"status": "partial", "hotels": [hotel.to_dict() for hotel in best.ranked()]}
+
+        result = _hotel_result(best.ranked(), min_price_per_night, max_price_per_night)
+        if failed and result['status'] == 'error':
+            result = {"status": "error", "error": "Error checking hotels: the hotel offers search failed for some hotels. Please try again."}
+        elif failed:
+            # Marked partial so the cache does not keep it as the full answer
+            result.update(partial=True, note="Partial results: some hotels could not be searched, so cheaper or better rated hotels may be missing")
+
+    except ResponseError as e:
+        result = {"status": "error", "error": f"Error checking hotels: {str(e)}"}
+    except Exception as e:
+        result = {"status": "error", "error": f"Unexpected error: {str(e)}"}
+    yield result
+
+
+@tool('amadeus', ttl=15 * 60, stale_ttl=15 * 60, memo=session_memo(HotelOffer, ('min_price_per_night', 'max_price_per_night', 'sort_by'), _answer_hotels))
+async def check_hotels(
+    city_code: str,
+    check_in_date: str,
+    check_out_date: str,
+    adults: int = 1,
+    min_price_per_night: float = 0,
+    max_price_per_night: float = 10000,
+    sort_by: str = 'price',
+    tool_context: Optional['ToolContext'] = None
+) -> dict:
     """
     Search for available hotels in a city with optional price filtering.
 
     Args:
-        city_code (str): IATA city code (e.g., 'NYC' for New York, 'PAR' for Paris)
+        city_code (str): IATA city code (e.g., 'NYC' for New York, 'PAR' for Paris); airport codes such as 'JFK' are mapped to their city
         check_in_date (str): Check-in date in format mm/dd/yy (e.g., '12/13/25')
         check_out_date (str): Check-out date in format mm/dd/yy (e.g., '12/15/25')
         adults (int): Number of adults (default: 1)
         min_price_per_night (float): Minimum price per night in USD (default: 0)
         max_price_per_night (float): Maximum price per night in USD (default: 10000)
+        sort_by (str): 'price' for the cheapest stays or 'rating' for the best rated (default: 'price')
 
     Returns:
         dict: Dictionary with 'status' and 'hotels' or 'error' containing hotel details
     """
-    try:
-        formatted_check_in = datetime.strptime(check_in_date, '%m/%d/%y').strftime('%Y-%m-%d')
-        formatted_check_out = datetime.strptime(check_out_date, '%m/%d/%y').strftime('%Y-%m-%d')
+    async for result in _search_hotels(city_code, check_in_date, check_out_date, adults, min_price_per_night, max_price_per_night, sort_by):
+        pass
+    return result
 
-        hotels_list_response = amadeus.reference_data.locations.hotels.by_city.get(
-            cityCode=city_code
-        )
 
-        if not hotels_list_response.data:
-            return {"status": "error", "error": "No hotels found in this city"}
+@streaming_tool('amadeus')
+async def stream_hotels(
+    city_code: str,
+    check_in_date: str,
+    check_out_date: str,
+    adults: int = 1,
+    min_price_per_night: float = 0,
+    max_price_per_night: float = 10000,
+    sort_by: str = 'price'
+) -> AsyncGenerator[dict, None]:
+    """
+    Search for available hotels in a city and stream the best hotels found so far while the search runs.
 
-        hotel_ids = [hotel['hotelId'] for hotel in hotels_list_response.data[:100]]
+    Args:
+        city_code (str): IATA city code (e.g., 'NYC' for New York, 'PAR' for Paris); airport codes such as 'JFK' are mapped to their city
+        check_in_date (str): Check-in date in format mm/dd/yy (e.g., '12/13/25')
+        check_out_date (str): Check-out date in format mm/dd/yy (e.g., '12/15/25')
+        adults (int): Number of adults (default: 1)
+        min_price_per_night (float): Minimum price per night in USD (default: 0)
+        max_price_per_night (float): Maximum price per night in USD (default: 10000)
+        sort_by (str): 'price' for the cheapest stays or 'rating' for the best rated (default: 'price')
 
-        if not hotel_ids:
-            return {"status": "error", "error": "No hotel IDs available"}
+    Yields:
+        dict: Results with 'status' 'partial' and the 'hotels' found so far, then the final result of check_hotels
+    """
+    async for result in _search_hotels(city_code, check_in_date, check_out_date, adults, min_price_per_night, max_price_per_night, sort_by):
+        yield result
 
-        hotels = []
 
-        batch_size = 10
-        for i in range(0, min(len(hotel_ids), 100), batch_size):
-            batch_ids = hotel_ids[i:i+batch_size]
-            hotel_ids_str = ','.join(batch_ids)
+async def _fetch_daily_forecast(place: Place, start_date: str, end_date: str) -> Optional[dict]:
+    """
+    Fetch the Open-Meteo daily forecast for a place over a date window in one request.
 
-            try:
-                offers_response = amadeus.shopping.hotel_offers_search.get(
-                    hotelIds=hotel_ids_str,
-                    checkInDate=formatted_check_in,
-                    checkOutDate=formatted_check_out,
-                    adults=adults,
-                    currency='USD'
-                )
-
-                if offers_response.data:
-                    for offer_group in offers_response.data:
-                        hotel_data = offer_group.get('hotel', {})
-
-                        offers = offer_group.get('offers', [])
-                        if not offers:
-                            continue
-
-                        first_offer = offers[0]
-                        price_data = first_offer.get('price', {})
-                        room_data = first_offer.get('room', {})
-
-                        price_per_night = float(price_data.get('base', 0))
-
-                        if price_per_night < min_price_per_night or price_per_night > max_price_per_night:
-                            continue
-
-                        hotel = {
-                            'name': hotel_data.get('name', 'Unknown Hotel'),
-                            'rating': hotel_data.get('rating', 'N/A'),
-                            'price_per_night': f"${price_per_night:.2f}",
-                            'total_price': f"${float(price_data.get('total', 0)):.2f}",
-                            'currency': price_data.get('currency', 'USD'),
-                            'room_type': room_data.get('typeEstimated', {}).get('category', 'Standard'),
-                            'beds': room_data.get('typeEstimated', {}).get('beds', 'N/A')
-                        }
-                        hotels.append(hotel)
-
-                        if len(hotels) >= 15:
-                            break
-
-            except ResponseError as batch_error:
-                continue
+    Args:
+        place (Place): Geocoded location
+        start_date (str): First day in format YYYY-MM-DD
+        end_date (str): Last day in format YYYY-MM-DD
 
-            if len(hotels) >= 15:
-                break
+    Returns:
+        dict: The parallel 'daily' arrays from Open-Meteo, or None if the request failed
+    """
+    weather_url = (
+        f"https://api.open-meteo.com/v1/forecast?"
+        f"latitude={place.latitude}&longitude={place.longitude}"
+        f"&daily=temperature_2m_max,temperature_2m_min,precipitation_sum,precipitation_probability_max,weathercode,windspeed_10m_max"
+        f"&temperature_unit=fahrenheit&windspeed_unit=mph&precipitation_unit=inch"
+        f"&timezone=auto"
+        f"&start_date={start_date}&end_date={end_date}"
+    )
 
-        if hotels:
-            hotels.sort(key=lambda x: float(x['total_price'].replace('$', '')))
-            return {"status": "success", "hotels": hotels[:10]}
-        else:
-            if min_price_per_night > 0 or max_price_per_night < 10000:
-                return {"status": "error", "error": f"No hotels found in the ${min_price_per_night:.0f}-${max_price_per_night:.0f} per night price range for the specified dates. Try widening your price range or different dates."}
-            else:
-                return {"status": "error", "error": "No available hotel offers found for the specified dates"}
+    weather_response = await transport.async_get(weather_url)
+    with tracing.span('decode_response'):
+        weather_data = weather_response.json()
 
-    except ResponseError as e:
-        return {"status": "error", "error": f"Error checking hotels: {str(e)}"}
-    except Exception as e:
-        return {"status": "error", "error": f"Unexpected error: {str(e)}"}
+    if weather_response.status_code != 200 or 'daily' not in weather_data:
+        return None
+
+    return weather_data['daily']
+
+
+def _daily_records(daily: dict) -> List[DailyWeather]:
+    """
+    Turn the parallel Open-Meteo 'daily' arrays into one record per day in a single pass.
+
+    Args:
+        daily (dict): The 'daily' object of an Open-Meteo forecast response
+
+    Returns:
+        List[DailyWeather]: Weather for each day, in date order
+    """
+    days = zip(
+        daily['time'],
+        daily['temperature_2m_max'],
+        daily['temperature_2m_min'],
+        daily['weathercode'],
+        daily['precipitation_sum'],
+        daily['precipitation_probability_max'],
+        daily['windspeed_10m_max']
+    )
+    describe = get_reference_data().weather_description
 
-def check_weather(location: str, date: str) -> dict:
+    return [
+        DailyWeather(day, high, low, describe(code), precipitation, probability, wind)
+        for day, high, low, code, precipitation, probability, wind in days
+    ]
+
+
+@tool('open-meteo', ttl=3 * 60 * 60)
+async def check_weather(location: str, date: str) -> dict:
     """
     Get the weather forecast for a specific location and date.
     Uses Open-Meteo API which provides free weather forecasts up to 16 days.
@@ -212,67 +723,313 @@ def check_weather(location: str, date: str) -> dict:
         dict: Dictionary with 'status' and 'weather' or 'error' containing forecast information
     """
     try:
-        geocode_url = f"https://geocoding-api.open-meteo.com/v1/search?name={location}&count=1&language=en&format=json"
-        geo_response = requests.get(geocode_url)
-        geo_data = geo_response.json()
+        place = await geocode(location)
 
-        if not geo_data.get('results'):
+        if place is None:
             return {"status": "error", "error": f"Could not find location: {location}"}
 
-        latitude = geo_data['results'][0]['latitude']
-        longitude = geo_data['results'][0]['longitude']
-        location_name = geo_data['results'][0]['name']
-        country = geo_data['results'][0].get('country', '')
+        with tracing.span('parse_dates'):
+            formatted_date = datetime.strptime(date, '%m/%d/%y').strftime('%Y-%m-%d')
 
-        formatted_date = datetime.strptime(date, '%m/%d/%y').strftime('%Y-%m-%d')
+        daily = await _fetch_daily_forecast(place, formatted_date, formatted_date)
 
-        weather_url = (
-            f"https://api.open-meteo.com/v1/forecast?"
-            f"latitude={latitude}&longitude={longitude}"
-            f"&daily=temperature_2m_max,temperature_2m_min,precipitation_sum,precipitation_probability_max,weathercode,windspeed_10m_max"
-            f"&temperature_unit=fahrenheit&windspeed_unit=mph&precipitation_unit=inch"
-            f"&timezone=auto"
-            f"&start_date={formatted_date}&end_date={formatted_date}"
-        )
+        if daily is None:
+            return {"status": "error", "error": "Could not retrieve weather data for the specified date"}
 
-        weather_response = requests.get(weather_url)
-        weather_data = weather_response.json()
+        with tracing.span('format_result'):
+            weather_info = {'location': _place_label(place), **_daily_records(daily)[0].to_dict()}
 
-        if weather_response.status_code != 200 or 'daily' not in weather_data:
-            return {"status": "error", "error": "Could not retrieve weather data for the specified date"}
+        return {"status": "success", "weather": weather_info}
 
-        daily = weather_data['daily']
-
-        weather_codes = {
-            0: "Clear sky", 1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
-            45: "Foggy", 48: "Depositing rime fog",
-            51: "Light drizzle", 53: "Moderate drizzle", 55: "Dense drizzle",
-            61: "Slight rain", 63: "Moderate rain", 65: "Heavy rain",
-            71: "Slight snow", 73: "Moderate snow", 75: "Heavy snow",
-            77: "Snow grains", 80: "Slight rain showers", 81: "Moderate rain showers",
-            82: "Violent rain showers", 85: "Slight snow showers", 86: "Heavy snow showers",
-            95: "Thunderstorm", 96: "Thunderstorm with slight hail", 99: "Thunderstorm with heavy hail"
-        }
+    except ValueError as e:
+        return {"status": "error", "error": f"Invalid date format. Please use mm/dd/yy format: {str(e)}"}
+    except transport.TRANSPORT_ERRORS as e:
+        return {"status": "error", "error": f"Error contacting weather service: {str(e)}"}
+    except Exception as e:
+        return {"status": "error", "error": f"Error getting weather forecast: {str(e)}"}
 
-        weather_code = daily['weathercode'][0]
-        description = weather_codes.get(weather_code, "Unknown")
-
-        weather_info = {
-            'location': f"{location_name}, {country}" if country else location_name,
-            'date': formatted_date,
-            'temperature_high': f"{daily['temperature_2m_max'][0]:.1f}°F",
-            'temperature_low': f"{daily['temperature_2m_min'][0]:.1f}°F",
-            'description': description,
-            'precipitation': f"{daily['precipitation_sum'][0]:.2f} inches",
-            'precipitation_probability': f"{daily['precipitation_probability_max'][0]}%",
-            'max_wind_speed': f"{daily['windspeed_10m_max'][0]:.1f} mph"
-        }
 
-        return {"status": "success", "weather": weather_info}
+@tool('open-meteo', ttl=3 * 60 * 60)
+async def check_weather_range(location: str, start_date: str, end_date: str) -> dict:
+    """
+    Get the daily weather forecast for a location over a range of dates in a single lookup.
+    Use this instead of calling check_weather once per day when planning a multi-day trip.
+    Uses Open-Meteo API which provides free weather forecasts up to 16 days.
+
+    Args:
+        location (str): The location to get the weather for (city name)
+        start_date (str): First date in format mm/dd/yy (e.g., '01/15/26')
+        end_date (str): Last date in format mm/dd/yy (e.g., '01/21/26')
+
+    Returns:
+        dict: Dictionary with 'status', 'location' and 'forecast' (one entry per day) or 'error'
+    """
+    try:
+        place = await geocode(location)
+
+        if place is None:
+            return {"status": "error", "error": f"Could not find location: {location}"}
+
+        with tracing.span('parse_dates'):
+            first_day = datetime.strptime(start_date, '%m/%d/%y')
+            last_day = datetime.strptime(end_date, '%m/%d/%y')
+
+        if last_day < first_day:
+            return {"status": "error", "error": "The end date must be on or after the start date"}
+        if (last_day - first_day).days >= MAX_FORECAST_DAYS:
+            return {"status": "error", "error": f"Forecasts are limited to {MAX_FORECAST_DAYS} days. Please use a shorter date range."}
+
+        daily = await _fetch_daily_forecast(place, first_day.strftime('%Y-%m-%d'), last_day.strftime('%Y-%m-%d'))
+
+        if daily is None:
+            return {"status": "error", "error": "Could not retrieve weather data for the specified dates"}
+
+        with tracing.span('format_result', days=len(daily['time'])):
+            forecast = [day.to_dict() for day in _daily_records(daily)]
+        return {"status": "success", "location": _place_label(place), "forecast": forecast}
 
     except ValueError as e:
         return {"status": "error", "error": f"Invalid date format. Please use mm/dd/yy format: {str(e)}"}
-    except requests.RequestException as e:
+    except transport.TRANSPORT_ERRORS as e:
         return {"status": "error", "error": f"Error contacting weather service: {str(e)}"}
     except Exception as e:
         return {"status": "error", "error": f"Error getting weather forecast: {str(e)}"}
+
+
+def _place_label(place: Place) -> str:
+    return f"{place.name}, {place.country}" if place.country else place.name
+
+
+def _matching_cars(cars: List[CarRental], max_price_per_day: float, car_type: str) -> List[CarRental]:
+    """
+    Keep the cars within a daily budget and of a vehicle class.
+
+    Args:
+        cars (List[CarRental]): Cars of a search
+        max_price_per_day (float): Highest daily rate in USD (0 for no limit)
+        car_type (str): Vehicle class to keep, matched case-insensitively (e.g., 'SUV'; '' for all)
+
+    Returns:
+        List[CarRental]: The matching cars, in the same order
+    """
+    wanted = car_type.strip().lower()
+    return [
+        car for car in cars
+        if (not max_price_per_day or car.price_per_day <= max_price_per_day) and wanted in car.car_type.lower()
+    ]
+
+
+def _car_result(cars: List[CarRental]) -> dict:
+    """
+    Format the cheapest cars of a search as the check_car_rentals result.
+
+    Args:
+        cars (List[CarRental]): The cheapest matching cars, cheapest first
+
+    Returns:
+        dict: The check_car_rentals result
+    """
+    if not cars:
+        return {"status": "error", "error": "No car rentals found for the specified dates"}
+    with tracing.span('format_result', cars=len(cars)):
+        return {"status": "success", "cars": [car.to_dict() for car in cars]}
+
+
+def _answer_car_rentals(cars: List[CarRental], complete: bool, arguments: dict) -> Optional[dict]:
+    # After a partial search the providers that were missing are asked again
+    if not complete:
+        return None
+    cheapest = TopK(CAR_RESULTS, key=attrgetter('total_price'))
+    cheapest.extend(_matching_cars(cars, arguments['max_price_per_day'], arguments['car_type']))
+    return _car_result(cheapest.ranked())
+
+
+def _car_identity(car: CarRental) -> tuple:
+    # The same car from the same supplier at the same price, whichever provider listed it
+    return car.car_name.casefold(), car.company.casefold(), round(car.total_price, 2)
+
+
+def _car_provider_error(provider: CarProvider, error: Exception) -> str:
+    if isinstance(error, CarProviderError):
+        return str(error)
+    if isinstance(error, transport.TRANSPORT_ERRORS):
+        return f"Error contacting car rental service: {str(error)}"
+    return f"Error searching car rentals: {str(error)}"
+
+
+async def _query_car_provider(provider: CarProvider, query: CarRentalQuery) -> tuple:
+    """
+    Search one car rental provider.
+
+    Returns:
+        tuple: (provider, offers, None) or (provider, None, the exception it failed with)
+    """
+    try:
+        with tracing.span('car_provider', provider=provider.name) as current:
+            cars = await provider.search(query)
+            if current is not None:
+                current.set(cars=len(cars))
+        return provider, cars, None
+    except Exception as e:
+        return provider, None, e
+
+
+async def _search_car_rentals(pickup_location: str, pickup_date: str, dropoff_date: str, pickup_time: str, dropoff_time: str, max_price_per_day: float, car_type: str) -> AsyncIterator[dict]:
+    """
+    Search every car rental provider at once and yield the cheapest cars found so far after each one answers.
+
+    Each provider has its own deadline (see car_providers.car_providers), so
+    the slowest one cannot hold up the answer once another provider has
+    answered: a provider that misses its deadline after that, or fails, is
+    left out, and the result is marked 'partial' with a 'note' naming it.
+    Until some provider has answered, every provider is waited for (within the
+    transport's own timeouts and retries), so a slow but working provider
+    still gives results, and a single provider is never cut short. Offers are
+    deduplicated by vehicle, supplier and price across providers, and the
+    cheapest CAR_RESULTS are kept in a running heap.
+
+    Yields:
+        dict: {'status': 'partial', 'cars': [...]} after each provider that added cars while others are still searching, then the final result
+    """
+    try:
+        with tracing.span('parse_dates'):
+            formatted_pickup = datetime.strptime(pickup_date, '%m/%d/%y').strftime('%Y-%m-%d')
+            formatted_dropoff = datetime.strptime(dropoff_date, '%m/%d/%y').strftime('%Y-%m-%d')
+
+        query = CarRentalQuery(pickup_location, formatted_pickup, pickup_time, formatted_dropoff, dropoff_time)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        providers = {asyncio.create_task(_query_car_provider(provider, query)): provider for provider in car_providers()}
+        collector = current_collector()
+        cheapest = TopK(CAR_RESULTS, key=attrgetter('total_price'))
+        seen = set()
+        failures = []
+        answered = False
+        pending = set(providers)
+        try:
+            while pending:
+                # No deadline applies until some provider has answered
+                timeout = None
+                if answered:
+                    timeout = max(0.0, started + min(providers[task].deadline for task in pending) - loop.time())
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    overdue = {task for task in pending if started + providers[task].deadline <= loop.time()}
+                    for task in overdue:
+                        task.cancel()
+                        failures.append((providers[task], asyncio.TimeoutError()))
+                    pending -= overdue
+                    continue
+
+                new_cars = []
+                for finished in done:
+                    provider, cars, error = finished.result()
+                    if error is not None:
+                        failures.append((provider, error))
+                        continue
+                    answered = True
+                    for car in cars:
+                        identity = _car_identity(car)
+                        if identity not in seen:
+                            seen.add(identity)
+                            new_cars.append(car)
+                if collector is not None:
+                    collector.add(new_cars)
+                matching = _matching_cars(new_cars, max_price_per_day, car_type)
+                cheapest.extend(matching)
+                if matching and pending:
+                    yield {"status": "partial", "cars": [car.to_dict() for car in cheapest.ranked()]}
+        finally:
+            for task in providers:
+                task.cancel()
+            await asyncio.gather(*providers, return_exceptions=True)
+
+        if collector is not None:
+            collector.complete = not failures
+
+        if len(failures) == len(providers):
+            errors = [_car_provider_error(provider, error) for provider, error in failures]
+            result = {"status": "error", "error": '; '.join(errors) or "No car rental providers are configured"}
+        elif not seen:
+            result = {"status": "error", "error": "No car rentals found for the specified location and dates"}
+        else:
+            result = _car_result(cheapest.ranked())
+        if failures and len(failures) < len(providers):
+            missing = ', '.join(provider.name for provider, error in failures)
+            result.update(partial=True, note=f"Partial results without {missing} (failed or too slow), so cheaper cars may be missing")
+
+    except ValueError as e:
+        result = {"status": "error", "error": f"Invalid date format. Use mm/dd/yy: {str(e)}"}
+    except Exception as e:
+        result = {"status": "error", "error": f"Error searching car rentals: {str(e)}"}
+    yield result
+
+
+@tool('car-rentals', ttl=15 * 60, memo=session_memo(CarRental, ('max_price_per_day', 'car_type'), _answer_car_rentals))
+async def check_car_rentals(
+    pickup_location: str,
+    pickup_date: str,
+    dropoff_date: str,
+    pickup_time: str = "10:00",
+    dropoff_time: str = "10:00",
+    max_price_per_day: float = 0,
+    car_type: str = "",
+    tool_context: Optional['ToolContext'] = None
+) -> dict:
+    """
+    Search for available car rentals at airports or cities, across every configured rental provider at once.
+
+    Args:
+        pickup_location (str): Airport IATA code (e.g., 'LAX', 'JFK', 'ORD')
+        pickup_date (str): Pickup date in format mm/dd/yy (e.g., '12/13/25')
+        dropoff_date (str): Drop-off date in format mm/dd/yy (e.g., '12/15/25')
+        pickup_time (str): Pickup time in HH:MM format (default: '10:00')
+        dropoff_time (str): Drop-off time in HH:MM format (default: '10:00')
+        max_price_per_day (float): Only show cars up to this daily rate in USD (default: 0, no limit)
+        car_type (str): Only show this vehicle class, e.g. 'Economy' or 'SUV' (default: all classes)
+
+    Returns:
+        dict: Dictionary with 'status' and 'cars' (cheapest first) or 'error' containing rental details, plus a 'note' when some providers did not answer in time
+    """
+    async for result in _search_car_rentals(pickup_location, pickup_date, dropoff_date, pickup_time, dropoff_time, max_price_per_day, car_type):
+        pass
+    return result
+
+
+@streaming_tool('car-rentals')
+async def stream_car_rentals(
+    pickup_location: str,
+    pickup_date: str,
+    dropoff_date: str,
+    pickup_time: str = "10:00",
+    dropoff_time: str = "10:00",
+    max_price_per_day: float = 0,
+    car_type: str = ""
+) -> AsyncGenerator[dict, None]:
+    """
+    Search for available car rentals and stream the cheapest cars found so far while the search runs.
+
+    Args:
+        pickup_location (str): Airport IATA code (e.g., 'LAX', 'JFK', 'ORD')
+        pickup_date (str): Pickup date in format mm/dd/yy (e.g., '12/13/25')
+        dropoff_date (str): Drop-off date in format mm/dd/yy (e.g., '12/15/25')
+        pickup_time (str): Pickup time in HH:MM format (default: '10:00')
+        dropoff_time (str): Drop-off time in HH:MM format (default: '10:00')
+        max_price_per_day (float): Only show cars up to this daily rate in USD (default: 0, no limit)
+        car_type (str): Only show this vehicle class, e.g. 'Economy' or 'SUV' (default: all classes)
+
+    Yields:
+        dict: Results with 'status' 'partial' and the 'cars' found so far, then the final result of check_car_rentals
+    """
+    async for result in _search_car_rentals(pickup_location, pickup_date, dropoff_date, pickup_time, dropoff_time, max_price_per_day, car_type):
+        yield result
+
+
+check_flights_sync = sync_tool(check_flights)
+check_flights_flexible_sync = sync_tool(check_flights_flexible)
+check_itinerary_sync = sync_tool(check_itinerary)
+check_round_trip_sync = sync_tool(check_round_trip)
+check_hotels_sync = sync_tool(check_hotels)
+check_weather_sync = sync_tool(check_weather)
+check_weather_range_sync = sync_tool(check_weather_range)
+check_car_rentals_sync = sync_tool(check_car_rentals)
@@ -0,0 +1,451 @@
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+PROFILE_RATE = float(os.getenv('TRAVEL_AGENT_PROFILE_RATE', '0'))
+PROFILE_TOP = 25
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger('travel_agent.tracing')
+profile_logger = logging.getLogger('travel_agent.profile')
+
+
+class Span:
+    """
+    One timed step of a tool call: the call itself, date parsing, an upstream request, parsing or formatting.
+
+    Spans started inside another span (also across asyncio tasks and
+    asyncio.to_thread workers) become its children and share its trace ID.
+    """
+
+    def __init__(self, name: str, parent: Optional['Span'], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.status = 'ok'
+        self.error = None
+        self.start_time = time.time()
+        self.duration = 0.0
+        self._start = time.perf_counter()
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def set_status(self, status: str, error: Optional[str] = None):
+        self.status = status
+        self.error = error
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'status': self.status,
+            'error': self.error,
+            'start_time': self.start_time,
+            'duration_ms': round(1000 * self.duration, 2),
+            'attributes': self.attributes,
+        }
+
+
+class SpanSink:
+    """
+    Receives spans as they start and finish. Subclass it to export spans elsewhere.
+    """
+
+    def on_start(self, span: Span):
+        pass
+
+    def on_end(self, span: Span):
+        pass
+
+
+class LogSink(SpanSink):
+    """
+    Writes every finished span as one JSON log line.
+
+    Args:
+        log (logging.Logger): Logger to write to (default: 'travel_agent.tracing')
+        level (int): Log level of the span lines (default: INFO)
+    """
+
+    def __init__(self, log: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.log = log or logger
+        self.level = level
+
+    def on_end(self, span: Span):
+        if self.log.isEnabledFor(self.level):
+            self.log.log(self.level, json.dumps(span.to_dict(), default=str))
+
+
+class PrometheusSink(SpanSink):
+    """
+    Aggregates span durations into histograms exposed in the Prometheus text format.
+
+    Spans are labelled by name and status, so tools, upstream hosts and hotel
+    batches each get their own series.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: Dict[tuple, list] = {}
+
+    def on_end(self, span: Span):
+        key = (span.name, span.status)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(DURATION_BUCKETS), 0, 0.0]
+            buckets = series[0]
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if span.duration <= bound:
+                    buckets[i] += 1
+            series[1] += 1
+            series[2] += span.duration
+
+    def render(self) -> str:
+        """
+        Render the collected histograms in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics text
+        """
+        lines = [
+            '# HELP travel_agent_span_duration_seconds Duration of traced tool steps.',
+            '# TYPE travel_agent_span_duration_seconds histogram',
+        ]
+        with self._lock:
+            for (name, status), (buckets, count, total) in sorted(self._series.items()):
+                labels = f'span="{_escape_label(name)}",status="{status}"'
+                for bound, bucket_count in zip(DURATION_BUCKETS, buckets):
+                    lines.append(f'travel_agent_span_duration_seconds_bucket{{{labels},le="{bound}"}} {bucket_count}')
+                lines.append(f'travel_agent_span_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f'travel_agent_span_duration_seconds_sum{{{labels}}} {total:.6f}')
+                lines.append(f'travel_agent_span_duration_seconds_count{{{labels}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port: int, host: str = '127.0.0.1'):
+        """
+        Serve the metrics at http://host:port/metrics from a background thread.
+
+        Args:
+            port (int): Port to listen on (0 picks a free port)
+            host (str): Interface to bind (default: localhost only)
+
+        Returns:
+            http.server.ThreadingHTTPServer: The running server
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        sink = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                payload = sink.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='travel-agent-metrics', daemon=True).start()
+        return server
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class OpenTelemetrySink(SpanSink):
+    """
+    Re-emits spans through OpenTelemetry, nested under the active OpenTelemetry span (e.g. ADK's tool span).
+
+    Requires the opentelemetry-api package; an SDK and exporter must be
+    configured by the application for the spans to leave the process.
+
+    Args:
+        tracer: OpenTelemetry tracer to use (default: the 'travel_agent' tracer of the global provider)
+    """
+
+    def __init__(self, tracer=None):
+        from opentelemetry import trace
+
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer('travel_agent')
+        self._lock = threading.Lock()
+        self._spans: Dict[str, Any] = {}
+
+    def on_start(self, span: Span):
+        with self._lock:
+            parent = self._spans.get(span.parent_id)
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        otel_span = self._tracer.start_span(span.name, context=context, start_time=int(span.start_time * 1e9))
+        with self._lock:
+            self._spans[span.span_id] = otel_span
+
+    def on_end(self, span: Span):
+        with self._lock:
+            otel_span = self._spans.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        otel_span.set_attributes({
+            f'travel_agent.{key}': value if isinstance(value, (str, bool, int, float)) else json.dumps(value, default=str)
+            for key, value in span.attributes.items() if value is not None
+        })
+        if span.status != 'ok':
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=int((span.start_time + span.duration) * 1e9))
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar('travel_agent_span', default=None)
+_profile_forced: contextvars.ContextVar = contextvars.ContextVar('travel_agent_profile', default=False)
+_profile_lock = threading.Lock()
+_sinks: Optional[List[SpanSink]] = None
+_sinks_lock = threading.Lock()
+_metrics_server = None
+
+
+def get_sinks() -> List[SpanSink]:
+    """
+    Return the active span sinks, configuring them from the environment on first use.
+
+    TRAVEL_AGENT_TRACE lists the sinks to enable: 'log', 'prometheus' and/or
+    'otel' (comma-separated). With 'prometheus', TRAVEL_AGENT_METRICS_PORT
+    starts the /metrics endpoint. An empty list turns tracing off.
+
+    Returns:
+        List[SpanSink]: Active sinks
+    """
+    global _sinks
+    if _sinks is None:
+        with _sinks_lock:
+            if _sinks is None:
+                _sinks = _sinks_from_env()
+    return _sinks
+
+
+def set_sinks(sinks: Optional[List[SpanSink]]):
+    """
+    Replace the active span sinks (None reconfigures them from the environment on next use).
+
+    Args:
+        sinks (List[SpanSink]): Sinks to export spans to; an empty list turns tracing off
+    """
+    global _sinks
+    with _sinks_lock:
+        _sinks = list(sinks) if sinks is not None else None
+
+
+def add_sink(sink: SpanSink):
+    """
+    Export spans to one more sink in addition to the active ones.
+
+    Args:
+        sink (SpanSink): Sink to add
+    """
+    global _sinks
+    current = get_sinks()
+    with _sinks_lock:
+        _sinks = current + [sink]
+
+
+def _sinks_from_env() -> List[SpanSink]:
+    global _metrics_server
+    names = [name.strip().lower() for name in os.getenv('TRAVEL_AGENT_TRACE', '').split(',') if name.strip()]
+    sinks = []
+    for name in names:
+        if name == 'log':
+            sinks.append(LogSink())
+        elif name == 'prometheus':
+            sink = PrometheusSink()
+            port = os.getenv('TRAVEL_AGENT_METRICS_PORT')
+            if port and _metrics_server is None:
+                _metrics_server = sink.serve(int(port))
+            sinks.append(sink)
+        elif name in ('otel', 'opentelemetry'):
+            sinks.append(OpenTelemetrySink())
+        else:
+            raise ValueError(f"Unknown TRAVEL_AGENT_TRACE sink '{name}'. Use log, prometheus or otel")
+    return sinks
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes):
+    """
+    Time a block of work as a span, nested under the current span if there is one.
+
+    Exceptions raised in the block mark the span as failed and propagate. When
+    no sinks are configured this does nothing and yields None.
+
+    Args:
+        name (str): Span name (e.g., 'parse_dates')
+        **attributes: Attributes recorded on the span
+
+    Yields:
+        Span: The running span, or None when tracing is off
+    """
+    sinks = get_sinks()
+    if not sinks:
+        yield None
+        return
+
+    current = Span(name, _current.get(), attributes)
+    _notify(sinks, 'on_start', current)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.set_status('cancelled' if type(e).__name__ == 'CancelledError' else 'error', f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current.reset(token)
+        current.finish()
+        _notify(sinks, 'on_end', current)
+
+
+def _notify(sinks: List[SpanSink], event: str, current: Span):
+    for sink in sinks:
+        try:
+            getattr(sink, event)(current)
+        except Exception:
+            logger.exception('Span sink %s failed on %s', type(sink).__name__, event)
+
+
+def annotate(**attributes):
+    """
+    Add attributes to the current span, if tracing is on.
+
+    Args:
+        **attributes: Attributes to record
+    """
+    current = _current.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+@contextlib.contextmanager
+def profiling(enabled: bool = True):
+    """
+    Profile every tool call made inside this block (or none of them, with enabled=False).
+
+    Args:
+        enabled (bool): Whether tool calls in the block are profiled
+    """
+    token = _profile_forced.set(enabled)
+    try:
+        yield
+    finally:
+        _profile_forced.reset(token)
+
+
+def set_profile_rate(rate: float):
+    """
+    Change the share of tool calls that are profiled, without restarting.
+
+    Args:
+        rate (float): Fraction between 0 (off) and 1 (every call)
+    """
+    global PROFILE_RATE
+    PROFILE_RATE = min(1.0, max(0.0, rate))
+
+
+def _should_profile() -> bool:
+    forced = _profile_forced.get()
+    return forced or (PROFILE_RATE > 0 and random.random() < PROFILE_RATE)
+
+
+@contextlib.contextmanager
+def _profile(tool_name: str, current: Optional[Span]):
+    if not _should_profile() or not _profile_lock.acquire(blocking=False):
+        yield
+        return
+
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        _profile_lock.release()
+        yield
+        return
+
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _profile_lock.release()
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(PROFILE_TOP)
+        if current is not None:
+            current.set(profile=report.getvalue())
+        profile_logger.info('Profile of %s:\n%s', tool_name, report.getvalue())
+
+
+def _tool_arguments(signature: inspect.Signature, args: tuple, kwargs: dict) -> Dict[str, Any]:
+    try:
+        bound = signature.bind(*args, **kwargs)
+    except TypeError:
+        return {}
+    bound.apply_defaults()
+    return {name: value for name, value in bound.arguments.items() if name != 'tool_context'}
+
+
+def _record_result(current: Optional[Span], result: Any):
+    if current is not None and isinstance(result, dict) and result.get('status') == 'error':
+        current.set_status('error', result.get('error'))
+
+
+def traced_tool(func: Callable) -> Callable:
+    """
+    Record every call of a tool function as a root span carrying its arguments and result status.
+
+    A result with status 'error' marks the span as failed. Calls are also
+    profiled with cProfile when profiling is turned on for them (see
+    profiling() and TRAVEL_AGENT_PROFILE_RATE). The profiler runs on the
+    calling thread, so it also sees whatever else the event loop runs
+    meanwhile; one call is profiled at a time.
+
+    Args:
+        func (Callable): Async tool function returning a result dict
+
+    Returns:
+        Callable: Wrapped function with the same name, signature and docstring
+    """
+    signature = inspect.signature(func)
+    tool_name = func.__name__
+    span_name = f"tool {tool_name}"
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        attributes = _tool_arguments(signature, args, kwargs) if get_sinks() else {}
+        with span(span_name, **attributes) as current, _profile(tool_name, current):
+            result = await func(*args, **kwargs)
+            _record_result(current, result)
+            return result
+
+    return wrapper
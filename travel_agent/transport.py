@@ -0,0 +1,597 @@
+import asyncio
+import concurrent.futures
+import os
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+from urllib.error import URLError
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import tracing
+from .ratelimit import RateLimitExceeded, get_limiter
+
+CONNECT_TIMEOUT = float(os.getenv('TRAVEL_AGENT_CONNECT_TIMEOUT', '3.05'))
+READ_TIMEOUT = float(os.getenv('TRAVEL_AGENT_READ_TIMEOUT', '20'))
+MAX_RETRIES = int(os.getenv('TRAVEL_AGENT_MAX_RETRIES', '2'))
+POOL_SIZE = int(os.getenv('TRAVEL_AGENT_POOL_SIZE', '20'))
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+BACKOFF_BASE = 0.25
+BACKOFF_MAX = 8.0
+LATENCY_SAMPLES = 512
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MAX_TOKENS = 10.0
+
+TRANSPORT_ERRORS = (requests.RequestException, httpx.HTTPError, RateLimitExceeded)
+
+
+class HostMetrics:
+    """
+    Request, error and latency counters for one upstream host.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        samples = sorted(self.latencies)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'error_rate': round(self.errors / self.requests, 4) if self.requests else 0.0,
+            'avg_ms': round(1000 * self.total_latency / self.requests, 1) if self.requests else 0.0,
+            'p50_ms': _percentile_ms(samples, 0.50),
+            'p95_ms': _percentile_ms(samples, 0.95),
+            'p99_ms': _percentile_ms(samples, 0.99),
+            'max_ms': round(1000 * self.max_latency, 1),
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+            'hedge_win_rate': round(self.hedge_wins / self.hedges, 4) if self.hedges else 0.0,
+        }
+
+
+class HedgePolicy:
+    """
+    When to send a second copy of a slow GET request (a hedge), and how many hedges are allowed.
+
+    A GET that has not answered after the `percentile` latency of the recent
+    requests to the same host and path is sent once more, and whichever copy
+    answers first is used; the other is cancelled. Until HEDGE_MIN_SAMPLES
+    requests have been seen there is no delay to go by, so nothing is hedged.
+
+    Every request earns `budget` hedge tokens for its host (up to
+    HEDGE_MAX_TOKENS) and every hedge spends one, so hedges add at most that
+    share of extra load. A hedge also needs a free slot in the provider's rate
+    limiter; it never waits for one.
+
+    Args:
+        hosts (frozenset): Hosts whose requests may be hedged (None for every host)
+        percentile (float): Latency percentile after which a request is hedged (0-1)
+        budget (float): Hedges allowed per request (e.g., 0.05 for at most 5% extra requests)
+    """
+
+    def __init__(self, hosts: Optional[frozenset] = None, percentile: float = 0.95, budget: float = 0.05):
+        self.hosts = hosts
+        self.percentile = percentile
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._latencies: Dict[tuple, deque] = {}
+        self._tokens: Dict[str, float] = {}
+        self.over_budget = 0
+
+    def applies(self, host: str, method: str) -> bool:
+        return method == 'GET' and (self.hosts is None or host in self.hosts)
+
+    def delay(self, host: str, path: str) -> Optional[float]:
+        """
+        Seconds to wait for a request before hedging it.
+
+        Returns:
+            float: The percentile latency of recent requests, or None while there are too few samples
+        """
+        with self._lock:
+            samples = self._latencies.get((host, path))
+            if samples is None or len(samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+
+    def observe(self, host: str, path: str, latency: float):
+        with self._lock:
+            samples = self._latencies.get((host, path))
+            if samples is None:
+                samples = self._latencies[(host, path)] = deque(maxlen=LATENCY_SAMPLES)
+            samples.append(latency)
+            self._tokens[host] = min(HEDGE_MAX_TOKENS, self._tokens.get(host, 0.0) + self.budget)
+
+    def take(self, host: str) -> bool:
+        """
+        Spend one hedge token of a host.
+
+        Returns:
+            bool: True if the budget allows a hedge now
+        """
+        with self._lock:
+            if self._tokens.get(host, 0.0) < 1:
+                self.over_budget += 1
+                return False
+            self._tokens[host] -= 1
+            return True
+
+
+def hedge_policy_from_env() -> Optional[HedgePolicy]:
+    """
+    Build the hedging policy from the environment.
+
+    TRAVEL_AGENT_HEDGE is 'off' (default), 'on' for every host, or a
+    comma-separated list of hosts (e.g., 'test.api.amadeus.com,api.open-meteo.com').
+    TRAVEL_AGENT_HEDGE_PERCENTILE sets the latency percentile after which a
+    request is hedged (default 95) and TRAVEL_AGENT_HEDGE_BUDGET the hedges
+    allowed per request (default 0.05).
+
+    Returns:
+        HedgePolicy: The policy, or None when hedging is off
+    """
+    setting = os.getenv('TRAVEL_AGENT_HEDGE', 'off').strip().lower()
+    if setting in ('', 'off'):
+        return None
+    hosts = None if setting == 'on' else frozenset(host.strip() for host in setting.split(',') if host.strip())
+    percentile = float(os.getenv('TRAVEL_AGENT_HEDGE_PERCENTILE', '95')) / 100
+    budget = float(os.getenv('TRAVEL_AGENT_HEDGE_BUDGET', '0.05'))
+    return HedgePolicy(hosts, percentile, budget)
+
+
+def _percentile_ms(samples: list, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    return round(1000 * samples[min(len(samples) - 1, int(fraction * len(samples)))], 1)
+
+
+_metrics: Dict[str, HostMetrics] = {}
+_sessions: Dict[str, requests.Session] = {}
+_async_clients = weakref.WeakKeyDictionary()
+_upstream_overrides: Dict[str, str] = {}
+_lock = threading.Lock()
+_hedge_policy = hedge_policy_from_env()
+_hedge_executor = None
+
+
+def _record(host: str, latency: float, error: bool, retried: bool = False):
+    with _lock:
+        metrics = _metrics.get(host)
+        if metrics is None:
+            metrics = _metrics[host] = HostMetrics()
+        metrics.requests += 1
+        metrics.errors += int(error)
+        metrics.retries += int(retried)
+        metrics.total_latency += latency
+        metrics.max_latency = max(metrics.max_latency, latency)
+        metrics.latencies.append(latency)
+
+
+def _record_hedge(host: str, won: bool):
+    with _lock:
+        metrics = _metrics.get(host)
+        if metrics is None:
+            metrics = _metrics[host] = HostMetrics()
+        metrics.hedges += 1
+        metrics.hedge_wins += int(won)
+
+
+def set_hedge_policy(policy: Optional[HedgePolicy]):
+    """
+    Replace the hedging policy, for example to turn hedging on in benchmarks.
+
+    Args:
+        policy (HedgePolicy): The new policy, or None to turn hedging off
+    """
+    global _hedge_policy
+    _hedge_policy = policy
+
+
+def _hedge_delay(host: str, method: str, path: str) -> tuple:
+    # (policy, delay): the policy that sees this request's latency, and when to hedge it (None: never)
+    policy = _hedge_policy
+    if policy is None or not policy.applies(host, method):
+        return None, None
+    return policy, policy.delay(host, path)
+
+
+def _get_hedge_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _lock:
+            if _hedge_executor is None:
+                _hedge_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4 * POOL_SIZE, thread_name_prefix='hedge')
+    return _hedge_executor
+
+
+def _close_response(future: concurrent.futures.Future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _send_hedged(send: Callable[[], requests.Response], host: str, delay: float, policy: HedgePolicy, limiter, current: Optional[tracing.Span]) -> requests.Response:
+    """
+    Send a blocking request and, if it has not answered after `delay` seconds, a hedge; return the first answer.
+    """
+    executor = _get_hedge_executor()
+    primary = executor.submit(send)
+    done, _ = concurrent.futures.wait([primary], timeout=delay)
+    if done or not policy.take(host) or (limiter is not None and not limiter.try_acquire()):
+        return primary.result()
+
+    hedge = executor.submit(send)
+    pending, errors = {primary, hedge}, []
+    while pending:
+        done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                # The slower copy cannot be interrupted; release its connection once it answers
+                for loser in pending:
+                    loser.add_done_callback(_close_response)
+                _finish_hedge(host, current, future is hedge)
+                return future.result()
+            errors.append(future.exception())
+    _finish_hedge(host, current, False)
+    raise errors[0]
+
+
+async def _send_hedged_async(send: Callable, host: str, delay: float, policy: HedgePolicy, limiter, current: Optional[tracing.Span]) -> httpx.Response:
+    """
+    Async counterpart of _send_hedged(): the slower copy is cancelled.
+    """
+    primary = asyncio.ensure_future(send())
+    hedge = None
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not policy.take(host) or (limiter is not None and not limiter.try_acquire()):
+            return await primary
+
+        hedge = asyncio.ensure_future(send())
+        pending, errors = {primary, hedge}, []
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    _finish_hedge(host, current, task is hedge)
+                    return task.result()
+                errors.append(task.exception())
+        _finish_hedge(host, current, False)
+        raise errors[0]
+    finally:
+        for task in (primary, hedge):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+def _finish_hedge(host: str, current: Optional[tracing.Span], won: bool):
+    _record_hedge(host, won)
+    if current is not None:
+        current.set(hedged=True, hedge_won=won)
+
+
+def set_upstream_override(host: str, base_url: Optional[str]):
+    """
+    Send every request for an upstream host to another base URL, such as a local stand-in server.
+
+    Metrics stay keyed by the original host.
+
+    Args:
+        host (str): Upstream host name (e.g., 'api.open-meteo.com')
+        base_url (str): Replacement scheme and host (e.g., 'http://127.0.0.1:8081'), or None to remove the override
+    """
+    with _lock:
+        if base_url is None:
+            _upstream_overrides.pop(host, None)
+        else:
+            _upstream_overrides[host] = base_url
+
+
+def _resolve(url: str) -> tuple:
+    parts = urlsplit(url)
+    base_url = _upstream_overrides.get(parts.netloc)
+    if base_url is None:
+        return parts.netloc, url
+    base = urlsplit(base_url)
+    return parts.netloc, urlunsplit((base.scheme, base.netloc, parts.path, parts.query, parts.fragment))
+
+
+def get_session(host: str) -> requests.Session:
+    """
+    Return the keep-alive session for an upstream host, creating it on first use.
+
+    Args:
+        host (str): Host name, optionally with port (e.g., 'api.open-meteo.com')
+
+    Returns:
+        requests.Session: Session whose connection pool is reused for every call to the host
+    """
+    session = _sessions.get(host)
+    if session is None:
+        with _lock:
+            session = _sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _sessions[host] = session
+    return session
+
+
+def backoff_delay(attempt: int, response: Any = None) -> float:
+    """
+    Compute how long to wait before a retry, using full jitter or the server's Retry-After.
+
+    Args:
+        attempt (int): Zero-based number of the attempt that just failed
+        response: The failed requests/httpx response, if one was received
+
+    Returns:
+        float: Delay in seconds
+    """
+    retry_after = _retry_after(response)
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _retry_after(response: Any) -> Optional[float]:
+    if response is None:
+        return None
+    retry_after = response.headers.get('Retry-After', '')
+    return float(retry_after) if retry_after.isdigit() else None
+
+
+def _retry_delay(limiter, attempt: int, response: Any) -> float:
+    # A limiter that saw the 429 already holds every caller back for Retry-After
+    if limiter is not None and response is not None and response.status_code == 429:
+        return 0.0
+    return backoff_delay(attempt, response)
+
+
+def request(method: str, url: str, timeout: Optional[tuple] = None, retries: Optional[int] = None, **kwargs) -> requests.Response:
+    """
+    Send an HTTP request through the pooled session of its host.
+
+    Connection errors, timeouts and 429/5xx responses are retried with jittered
+    exponential backoff. Every attempt is recorded in the per-host metrics and,
+    for rate-limited providers (see ratelimit.get_limiter()), waits for a slot
+    of the provider's limiter first.
+
+    Args:
+        method (str): HTTP method (e.g., 'GET')
+        url (str): Full request URL
+        timeout (tuple): (connect, read) timeout in seconds (default: TRAVEL_AGENT_CONNECT_TIMEOUT / TRAVEL_AGENT_READ_TIMEOUT)
+        retries (int): Number of retries after the first attempt (default: TRAVEL_AGENT_MAX_RETRIES)
+        **kwargs: Passed on to requests (params, headers, data, json)
+
+    Returns:
+        requests.Response: The last response received
+
+    Raises:
+        requests.RequestException: If the last attempt failed without a response
+        RateLimitExceeded: If the provider's limiter has no slot within its max_wait, or its daily budget is used up
+    """
+    host, url = _resolve(url)
+    session = get_session(host)
+    limiter = get_limiter(host)
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    retries = MAX_RETRIES if retries is None else retries
+    path = urlsplit(url).path
+    policy, hedge_delay = _hedge_delay(host, method, path)
+
+    def send():
+        return session.request(method, url, timeout=timeout, **kwargs)
+
+    with tracing.span(f"upstream {host}", method=method, path=path) as current:
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                limiter.acquire()
+            start = time.perf_counter()
+            try:
+                if hedge_delay is None:
+                    response = send()
+                else:
+                    response = _send_hedged(send, host, hedge_delay, policy, limiter, current)
+            except (requests.ConnectionError, requests.Timeout):
+                _record(host, time.perf_counter() - start, error=True, retried=attempt < retries)
+                if attempt == retries:
+                    raise
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            if limiter is not None:
+                limiter.observe(response.status_code, _retry_after(response))
+            should_retry = response.status_code in RETRY_STATUSES and attempt < retries
+            latency = time.perf_counter() - start
+            _record(host, latency, error=response.status_code >= 400, retried=should_retry)
+            if policy is not None and response.status_code < 400:
+                policy.observe(host, path, latency)
+            if not should_retry:
+                _trace_response(current, response.status_code, attempt)
+                return response
+            time.sleep(_retry_delay(limiter, attempt, response))
+
+
+def _trace_response(current: Optional[tracing.Span], status_code: int, attempt: int):
+    if current is not None:
+        current.set(status_code=status_code, attempts=attempt + 1)
+        if status_code >= 400:
+            current.set_status('error', f"HTTP {status_code}")
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """
+    Send a GET request through the shared transport (see request()).
+
+    Args:
+        url (str): Full request URL
+        **kwargs: Passed on to request()
+
+    Returns:
+        requests.Response: The response
+    """
+    return request('GET', url, **kwargs)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the keep-alive async client of the running event loop, creating it on first use.
+
+    httpx keeps a connection pool per host inside the client, so one client per
+    loop gives the async tools the same connection reuse as get_session().
+
+    Returns:
+        httpx.AsyncClient: Client bound to the running loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=POOL_SIZE, max_connections=4 * POOL_SIZE),
+            follow_redirects=True
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def async_request(method: str, url: str, timeout: Optional[tuple] = None, retries: Optional[int] = None, **kwargs) -> httpx.Response:
+    """
+    Async counterpart of request(): same timeouts, retries, backoff and metrics, on httpx.
+
+    Args:
+        method (str): HTTP method (e.g., 'GET')
+        url (str): Full request URL
+        timeout (tuple): (connect, read) timeout in seconds (default: TRAVEL_AGENT_CONNECT_TIMEOUT / TRAVEL_AGENT_READ_TIMEOUT)
+        retries (int): Number of retries after the first attempt (default: TRAVEL_AGENT_MAX_RETRIES)
+        **kwargs: Passed on to httpx (params, headers, content, json)
+
+    Returns:
+        httpx.Response: The last response received
+
+    Raises:
+        httpx.HTTPError: If the last attempt failed without a response
+        RateLimitExceeded: If the provider's limiter has no slot within its max_wait, or its daily budget is used up
+    """
+    host, url = _resolve(url)
+    client = get_async_client()
+    limiter = get_limiter(host)
+    connect_timeout, read_timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+    retries = MAX_RETRIES if retries is None else retries
+    path = urlsplit(url).path
+    policy, hedge_delay = _hedge_delay(host, method, path)
+
+    def send():
+        return client.request(method, url, timeout=timeout, **kwargs)
+
+    with tracing.span(f"upstream {host}", method=method, path=path) as current:
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                await limiter.acquire_async()
+            start = time.perf_counter()
+            try:
+                if hedge_delay is None:
+                    response = await send()
+                else:
+                    response = await _send_hedged_async(send, host, hedge_delay, policy, limiter, current)
+            except httpx.TransportError:
+                _record(host, time.perf_counter() - start, error=True, retried=attempt < retries)
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+
+            if limiter is not None:
+                limiter.observe(response.status_code, _retry_after(response))
+            should_retry = response.status_code in RETRY_STATUSES and attempt < retries
+            latency = time.perf_counter() - start
+            _record(host, latency, error=response.status_code >= 400, retried=should_retry)
+            if policy is not None and response.status_code < 400:
+                policy.observe(host, path, latency)
+            if not should_retry:
+                _trace_response(current, response.status_code, attempt)
+                return response
+            await asyncio.sleep(_retry_delay(limiter, attempt, response))
+
+
+async def async_get(url: str, **kwargs) -> httpx.Response:
+    """
+    Send a GET request through the shared async transport (see async_request()).
+
+    Args:
+        url (str): Full request URL
+        **kwargs: Passed on to async_request()
+
+    Returns:
+        httpx.Response: The response
+    """
+    return await async_request('GET', url, **kwargs)
+
+
+class _AmadeusResponse:
+    """
+    Adapts a requests.Response to the urllib response interface the Amadeus SDK parses.
+    """
+
+    def __init__(self, response: requests.Response):
+        self.status = response.status_code
+        self._response = response
+
+    def getheaders(self):
+        return [(key.title(), value) for key, value in self._response.headers.items()]
+
+    def read(self) -> bytes:
+        return self._response.content
+
+
+def amadeus_http(http_request) -> _AmadeusResponse:
+    """
+    HTTP function for amadeus.Client(http=...) that routes SDK calls through the shared transport.
+
+    Args:
+        http_request (urllib.request.Request): Request built by the Amadeus SDK
+
+    Returns:
+        _AmadeusResponse: Response in the shape the SDK expects
+
+    Raises:
+        URLError: If the host could not be reached or the rate limit allows no request, which the SDK reports as a NetworkError
+    """
+    try:
+        response = request(
+            http_request.get_method(),
+            http_request.full_url,
+            data=http_request.data,
+            headers=dict(http_request.header_items())
+        )
+    except (requests.RequestException, RateLimitExceeded) as e:
+        raise URLError(e)
+    return _AmadeusResponse(response)
+
+
+def transport_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Report request counts, error rates and latency percentiles for every upstream host.
+
+    Returns:
+        dict: Metrics keyed by host name
+    """
+    with _lock:
+        return {host: metrics.snapshot() for host, metrics in _metrics.items()}